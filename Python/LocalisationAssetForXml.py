@@ -16,8 +16,280 @@ Usage:
 import os
 import sys
 import re
+import mmap
+import shutil
+import socket
+import stat
 import ipaddress
-from typing import List, Tuple, Optional, Iterator
+from typing import Callable, Dict, List, Tuple, Optional
+
+#######################
+# Tag Patterns Module #
+#######################
+
+# Tags holding filesystem paths that get the user-defined prefix
+PATH_TAGS = ('ppsDiskPathF', 'neDiskPathF', 'ppsSFTPPathF', 'neSFTPClientPathF', 'matcherPathF', 'scPathF')
+HOST_TAGS = ('ppsSFTPHostF', 'neSFTPClientHostF')
+USERNAME_TAGS = ('ppsSFTPUserF', 'neSFTPClientUserF')
+# List of password-related tags to update (add more tags here in the future)
+PASSWORD_TAGS = ('ppsSFTPPasswordF', 'neSFTPClientPasswordF')
+# List of pass flag related tags to update (add more tags here in the future)
+FLAG_TAGS = ('ppsSFTPPassFlagF', 'neSFTPClientPassFlagF')
+DEFAULT_STOPPED_TAGS = ('defaultStoppedState',)
+
+ALL_TAGS = PATH_TAGS + HOST_TAGS + USERNAME_TAGS + PASSWORD_TAGS + FLAG_TAGS + DEFAULT_STOPPED_TAGS
+
+
+def build_tag_alternation(tags: Tuple[str, ...]) -> str:
+    """
+    Build a regex alternation matching any of the tags, factored by shared prefix.
+    
+    Tags such as ppsSFTPHostF and ppsSFTPPathF share their leading characters, so
+    they are merged into a trie (pps(?:SFTP(?:HostF|PathF))). The regex engine then
+    compares each shared prefix once instead of retrying it for every tag.
+    
+    Args:
+        tags: Tag names to match
+        
+    Returns:
+        str: Regex fragment matching exactly one of the tags
+    """
+    if len(tags) == 1:
+        return re.escape(tags[0])
+    
+    # Group the remaining characters of each tag by their first character
+    branches_by_first: Dict[str, List[str]] = {}
+    for tag in tags:
+        if tag:
+            branches_by_first.setdefault(tag[0], []).append(tag[1:])
+    
+    branches = []
+    for first, rests in sorted(branches_by_first.items()):
+        common = os.path.commonprefix(rests)
+        remainder = tuple(rest[len(common):] for rest in rests)
+        suffix = "" if remainder == ("",) else build_tag_alternation(remainder)
+        branches.append(re.escape(first + common) + suffix)
+    
+    optional = "?" if "" in tags else ""
+    if len(branches) == 1 and not optional:
+        return branches[0]
+    return f"(?:{'|'.join(branches)}){optional}"
+
+
+# One alternation over every supported tag, so a single scan serves all operations.
+# Content is optional here; handlers decide whether an empty tag is rewritten.
+# The pattern is applied to the raw bytes of the whole file, so plain values are
+# kept from spanning lines to match the previous line-by-line behaviour.
+_TAG_RE = re.compile(
+    rf"<(?P<tag>{build_tag_alternation(ALL_TAGS)})>(?:<!\[CDATA\[(?P<cdata>.*?)\]\]>|(?P<plain>[^<\n]+))?</(?P=tag)>".encode()
+)
+
+# Encoding used to hand tag values to the handlers and to write them back
+XML_ENCODING = 'utf-8'
+
+# Buffer size for file reads and pass-through copies (1 MiB)
+IO_BUFFER_SIZE = 1 << 20
+
+# A handler receives the current tag value (None for an empty tag) and returns
+# the new value, or None to leave the tag untouched. Handlers must depend on the
+# value only, as results are reused for identical tags.
+TagHandler = Callable[[Optional[str]], Optional[str]]
+
+
+#######################
+# Tag Rewrite Module #
+#######################
+
+def rewrite_xml_tags(input_file: str, output_file: str, handlers: Dict[str, TagHandler]) -> Dict[str, int]:
+    """
+    Rewrite the selected tags of an XML file in a single pass.
+    
+    The input is memory-mapped and scanned once with the combined tag pattern;
+    each match is dispatched to the handler registered for its tag. CDATA
+    wrapping is preserved and the result is written with a single write call.
+    
+    Args:
+        input_file: Path to the original XML file
+        output_file: Path for the modified XML file
+        handlers: Mapping of tag name to the handler producing its new value
+        
+    Returns:
+        Dict[str, int]: Number of rewritten occurrences per handled tag
+        
+    Raises:
+        IOError: If either file cannot be read or written
+    """
+    tag_counts = dict.fromkeys(handlers, 0)
+    # Rendered replacement per matched text. Tags such as the pass flags repeat
+    # with identical content throughout a file, so most matches are cache hits.
+    rendered: Dict[bytes, Tuple[Optional[str], bytes]] = {}
+    
+    def render(match: "re.Match") -> Tuple[Optional[str], bytes]:
+        tag = match.group('tag').decode('ascii')
+        handler = handlers.get(tag)
+        if handler is None:
+            return None, match.group(0)
+        
+        # The value is either in the CDATA group or the plain text group
+        cdata = match.group('cdata')
+        value = cdata if cdata is not None else match.group('plain')
+        if value is not None:
+            value = value.decode(XML_ENCODING, 'surrogateescape')
+        new_value = handler(value)
+        if new_value is None:
+            return None, match.group(0)
+        
+        if cdata is not None:
+            new_tag = f"<{tag}><![CDATA[{new_value}]]></{tag}>"
+        else:
+            new_tag = f"<{tag}>{new_value}</{tag}>"
+        return tag, new_tag.encode(XML_ENCODING, 'surrogateescape')
+    
+    def dispatch(match: "re.Match") -> bytes:
+        full_tag = match.group(0)
+        cached = rendered.get(full_tag)
+        if cached is None:
+            cached = rendered[full_tag] = render(match)
+        
+        tag, new_tag = cached
+        if tag is not None:
+            tag_counts[tag] += 1
+        return new_tag
+    
+    openings = [f"<{tag}>".encode('ascii') for tag in handlers]
+    
+    with open(input_file, 'rb') as in_file:
+        # Empty files cannot be mapped and have nothing to rewrite
+        content = b""
+        if os.fstat(in_file.fileno()).st_size:
+            with mmap.mmap(in_file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                if any(mapped.find(opening) != -1 for opening in openings):
+                    content = _TAG_RE.sub(dispatch, mapped)
+                else:
+                    content = None
+        
+        if content is None:
+            # None of the handled tags occurs, so copy the file through unchanged
+            in_file.seek(0)
+            with open(output_file, 'wb') as out_file:
+                shutil.copyfileobj(in_file, out_file, IO_BUFFER_SIZE)
+            return tag_counts
+    
+    with open(output_file, 'wb') as out_file:
+        out_file.write(content)
+    
+    return tag_counts
+
+
+def tags_found(tag_counts: Dict[str, int], tags: Tuple[str, ...]) -> bool:
+    """
+    Check whether any of the given tags was rewritten, warning the user if not.
+    
+    Args:
+        tag_counts: Rewrite counts as returned by rewrite_xml_tags
+        tags: Tags belonging to one operation
+        
+    Returns:
+        bool: True if at least one of the tags was rewritten, False otherwise
+    """
+    if any(tag_counts.get(tag) for tag in tags):
+        return True
+    
+    tag_list = ' or '.join(f'<{tag}>' for tag in tags)
+    print(f"Warning: No {tag_list} tags found in the XML file.")
+    return False
+
+
+def path_handlers(prefix: str, found_paths: Optional[List[Tuple[str, str]]] = None) -> Dict[str, TagHandler]:
+    """
+    Build handlers that prepend the prefix to every non-empty path tag.
+    
+    Args:
+        prefix: Path prefix to prepend
+        found_paths: Optional list receiving (tag_name, original_path) for each
+            distinct path tag rewritten, so the paths are collected in the same pass
+        
+    Returns:
+        Dict[str, TagHandler]: Handler for each tag of the operation
+    """
+    # Same result as os.path.join(prefix, relative_path), computed once
+    prefix_dir = prefix if not prefix or prefix.endswith('/') else prefix + '/'
+    
+    def make_handler(tag: str) -> TagHandler:
+        def prepend_prefix(path: Optional[str]) -> Optional[str]:
+            if not path:
+                return None
+            if found_paths is not None:
+                found_paths.append((tag, path))
+            # Create the new combined path
+            combined_path = prefix_dir + path.lstrip('/')
+            # Backslashes can only come from the XML value itself
+            return combined_path.replace("\\", "/")
+        return prepend_prefix
+    return {tag: make_handler(tag) for tag in PATH_TAGS}
+
+
+def host_handlers(new_host: str) -> Dict[str, TagHandler]:
+    """
+    Build handlers that replace every non-empty SFTP host tag.
+    
+    Every occurrence is rewritten, including further host tags of the same
+    kind on one line, which the old per-line search left unchanged.
+    
+    Args:
+        new_host: New SFTP host IP address
+        
+    Returns:
+        Dict[str, TagHandler]: Handler for each tag of the operation
+    """
+    return dict.fromkeys(HOST_TAGS, lambda value: None if value is None else new_host)
+
+
+def username_handlers(new_username: str) -> Dict[str, TagHandler]:
+    """
+    Build handlers that replace every SFTP username tag.
+    
+    Args:
+        new_username: New SFTP username
+        
+    Returns:
+        Dict[str, TagHandler]: Handler for each tag of the operation
+    """
+    return dict.fromkeys(USERNAME_TAGS, lambda value: new_username)
+
+
+def password_handlers(new_password: str) -> Dict[str, TagHandler]:
+    """
+    Build handlers that replace every SFTP password tag.
+    
+    Args:
+        new_password: New encrypted SFTP password
+        
+    Returns:
+        Dict[str, TagHandler]: Handler for each tag of the operation
+    """
+    return dict.fromkeys(PASSWORD_TAGS, lambda value: new_password)
+
+
+def pass_flag_handlers() -> Dict[str, TagHandler]:
+    """
+    Build handlers that set every SFTP pass flag tag to 0.
+    
+    Returns:
+        Dict[str, TagHandler]: Handler for each tag of the operation
+    """
+    return dict.fromkeys(FLAG_TAGS, lambda value: '0')
+
+
+def default_stopped_handlers() -> Dict[str, TagHandler]:
+    """
+    Build handlers that set every defaultStoppedState tag to 1 (True).
+    
+    Returns:
+        Dict[str, TagHandler]: Handler for each tag of the operation
+    """
+    return dict.fromkeys(DEFAULT_STOPPED_TAGS, lambda value: '1')
+
 
 #######################
 # Input Handler Module #
@@ -43,8 +315,13 @@ def validate_file_path(file_path: str) -> bool:
     Returns:
         bool: True if the file exists and is accessible, False otherwise
     """
-    # Check if the file exists
-    if not os.path.isfile(file_path):
+    # Check if the file exists, with a single stat call
+    try:
+        file_mode = os.stat(file_path).st_mode
+    except (OSError, ValueError):
+        # ValueError: the path contains a NUL character
+        file_mode = 0
+    if not stat.S_ISREG(file_mode):
         print(f"Error: The file '{file_path}' does not exist.")
         return False
     
@@ -102,11 +379,36 @@ def prompt_for_sftp_host() -> str:
             return 'localhost'
         
         # Validate as IP address
-        try:
-            ipaddress.ip_address(host)
+        if is_valid_ip_address(host):
             return host
-        except ValueError:
-            print("Error: Please enter a valid IP address (xxx.xxx.xxx.xxx) or 'localhost'")
+        print("Error: Please enter a valid IP address (xxx.xxx.xxx.xxx) or 'localhost'")
+
+
+def is_valid_ip_address(host: str) -> bool:
+    """
+    Check whether the host is a valid IPv4 or IPv6 address.
+    
+    IPv4 addresses are checked with socket.inet_pton, which parses strict
+    dotted-quad notation in C without building an address object. Anything
+    else is handed to the ipaddress module to accept IPv6 addresses.
+    
+    Args:
+        host: The host string to validate
+        
+    Returns:
+        bool: True if the host is a valid IP address, False otherwise
+    """
+    try:
+        socket.inet_pton(socket.AF_INET, host)
+        return True
+    except (OSError, ValueError):
+        # ValueError: the host contains a NUL character
+        pass
+    
+    try:
+        return ipaddress.ip_address(host).version == 6
+    except ValueError:
+        return False
 
 
 def prompt_for_encrypted_password() -> str:
@@ -140,332 +442,31 @@ def prompt_for_sftp_username() -> str:
             print("Error: Username cannot be empty")
 
 
-def update_sftp_username(file_path: str, output_file: str, new_username: str) -> bool:
-    """
-    Update SFTP username in the XML file for both ppsSFTPUserF and neSFTPClientUserF tags.
-    
-    Args:
-        file_path: Path to the original XML file
-        output_file: Path for the modified XML file
-        new_username: New SFTP username
-        
-    Returns:
-        bool: True if successful, False otherwise
-    """
-    try:
-        username_tags_found = False
-        
-        with open(file_path, 'r') as in_file, open(output_file, 'w') as out_file:
-            for line in in_file:
-                modified_line = line
-                
-                # Look for the ppsSFTPUserF tag
-                user_pattern = r"<ppsSFTPUserF>(?:<!\[CDATA\[(.*?)\]\]>|([^<]+))?</ppsSFTPUserF>"
-                matches = re.finditer(user_pattern, line)
-                
-                for match in matches:
-                    username_tags_found = True
-                    # Get the full tag content
-                    full_tag = match.group(0)
-                    
-                    # Check if the original had CDATA
-                    if "<![CDATA[" in full_tag:
-                        new_tag = f"<ppsSFTPUserF><![CDATA[{new_username}]]></ppsSFTPUserF>"
-                    else:
-                        new_tag = f"<ppsSFTPUserF>{new_username}</ppsSFTPUserF>"
-                    
-                    # Replace the old tag content with the new one
-                    modified_line = modified_line.replace(full_tag, new_tag)
-                
-                # Look for the neSFTPClientUserF tag
-                client_user_pattern = r"<neSFTPClientUserF>(?:<!\[CDATA\[(.*?)\]\]>|([^<]+))?</neSFTPClientUserF>"
-                client_matches = re.finditer(client_user_pattern, modified_line)
-                
-                for match in client_matches:
-                    username_tags_found = True
-                    # Get the full tag content
-                    full_tag = match.group(0)
-                    
-                    # Check if the original had CDATA
-                    if "<![CDATA[" in full_tag:
-                        new_tag = f"<neSFTPClientUserF><![CDATA[{new_username}]]></neSFTPClientUserF>"
-                    else:
-                        new_tag = f"<neSFTPClientUserF>{new_username}</neSFTPClientUserF>"
-                    
-                    # Replace the old tag content with the new one
-                    modified_line = modified_line.replace(full_tag, new_tag)
-                
-                out_file.write(modified_line)
-        
-        if not username_tags_found:
-            print("Warning: No <ppsSFTPUserF> or <neSFTPClientUserF> tags found in the XML file.")
-            return False
-            
-        return True
-    except IOError as e:
-        print(f"Error processing file: {e}")
-        return False
-
-
-def update_sftp_host(file_path: str, output_file: str, new_host: str) -> bool:
-    """
-    Update the SFTP host IP address in the XML file for both ppsSFTPHostF and neSFTPClientHostF tags.
-    
-    Args:
-        file_path: Path to the original XML file
-        output_file: Path for the modified XML file
-        new_host: New SFTP host IP address
-        
-    Returns:
-        bool: True if successful, False otherwise
-    """
-    try:
-        host_tags_found = False
-        
-        with open(file_path, 'r') as in_file, open(output_file, 'w') as out_file:
-            for line in in_file:
-                modified_line = line
-                
-                # Look for the ppsSFTPHostF tag
-                host_pattern = r"<ppsSFTPHostF>(?:<!\[CDATA\[(.*?)\]\]>|([^<]+))</ppsSFTPHostF>"
-                match = re.search(host_pattern, line)
-                
-                if match:
-                    host_tags_found = True
-                    # Get the full tag content
-                    full_tag = match.group(0)
-                    
-                    # Check if the original had CDATA
-                    if "<![CDATA[" in full_tag:
-                        new_tag = f"<ppsSFTPHostF><![CDATA[{new_host}]]></ppsSFTPHostF>"
-                    else:
-                        new_tag = f"<ppsSFTPHostF>{new_host}</ppsSFTPHostF>"
-                    
-                    # Replace the old tag content with the new one
-                    modified_line = modified_line.replace(full_tag, new_tag)
-                
-                # Look for the neSFTPClientHostF tag
-                client_host_pattern = r"<neSFTPClientHostF>(?:<!\[CDATA\[(.*?)\]\]>|([^<]+))</neSFTPClientHostF>"
-                client_match = re.search(client_host_pattern, modified_line)
-                
-                if client_match:
-                    host_tags_found = True
-                    # Get the full tag content
-                    full_tag = client_match.group(0)
-                    
-                    # Check if the original had CDATA
-                    if "<![CDATA[" in full_tag:
-                        new_tag = f"<neSFTPClientHostF><![CDATA[{new_host}]]></neSFTPClientHostF>"
-                    else:
-                        new_tag = f"<neSFTPClientHostF>{new_host}</neSFTPClientHostF>"
-                    
-                    # Replace the old tag content with the new one
-                    modified_line = modified_line.replace(full_tag, new_tag)
-                
-                out_file.write(modified_line)
-        
-        if not host_tags_found:
-            print("Warning: No <ppsSFTPHostF> or <neSFTPClientHostF> tags found in the XML file.")
-            return False
-            
-        return True
-    except IOError as e:
-        print(f"Error processing file: {e}")
-        return False
-
-
-def update_sftp_password(file_path: str, output_file: str, new_password: str) -> bool:
-    """
-    Update the encrypted SFTP password in the XML file for multiple password tags.
-    
-    Args:
-        file_path: Path to the original XML file
-        output_file: Path for the modified XML file
-        new_password: New encrypted SFTP password
-        
-    Returns:
-        bool: True if successful, False otherwise
-    """
-    try:
-        # List of password-related tags to update
-        password_tags = ['ppsSFTPPasswordF', 'neSFTPClientPasswordF']  # Add more tags here in the future
-        password_tags_found = False
-        
-        with open(file_path, 'r') as in_file, open(output_file, 'w') as out_file:
-            for line in in_file:
-                modified_line = line
-                
-                # Process each password tag
-                for tag in password_tags:
-                    # Look for the tag
-                    password_pattern = f"<{tag}>(?:<!\[CDATA\[(.*?)\]\]>|([^<]+))?</{tag}>"
-                    matches = re.finditer(password_pattern, modified_line)
-                    
-                    for match in matches:
-                        password_tags_found = True
-                        # Get the full tag content
-                        full_tag = match.group(0)
-                        
-                        # Check if the original had CDATA
-                        if "<![CDATA[" in full_tag:
-                            new_tag = f"<{tag}><![CDATA[{new_password}]]></{tag}>"
-                        else:
-                            new_tag = f"<{tag}>{new_password}</{tag}>"
-                        
-                        # Replace the old tag content with the new one
-                        modified_line = modified_line.replace(full_tag, new_tag)
-                
-                out_file.write(modified_line)
-        
-        if not password_tags_found:
-            found_tags = ', '.join([f'<{tag}>' for tag in password_tags])
-            print(f"Warning: None of the password tags ({found_tags}) found in the XML file.")
-            return False
-            
-        return True
-    except IOError as e:
-        print(f"Error processing file: {e}")
-        return False
-
-
-def update_sftp_pass_flags(file_path: str, output_file: str) -> bool:
-    """
-    Update all SFTP pass flag tags to contain 0.
-    
-    Args:
-        file_path: Path to the original XML file
-        output_file: Path for the modified XML file
-        
-    Returns:
-        bool: True if successful, False otherwise
-    """
-    try:
-        # List of pass flag related tags to update
-        flag_tags = ['ppsSFTPPassFlagF', 'neSFTPClientPassFlagF']  # Add more tags here in the future
-        flag_tags_found = False
-        
-        with open(file_path, 'r') as in_file, open(output_file, 'w') as out_file:
-            for line in in_file:
-                modified_line = line
-                
-                # Process each pass flag tag
-                for tag in flag_tags:
-                    # Look for the tag
-                    flag_pattern = f"<{tag}>(?:<!\[CDATA\[(.*?)\]\]>|([^<]+))?</{tag}>"
-                    matches = re.finditer(flag_pattern, modified_line)
-                    
-                    for match in matches:
-                        flag_tags_found = True
-                        # Get the full tag content
-                        full_tag = match.group(0)
-                        
-                        # Check if the original had CDATA
-                        if "<![CDATA[" in full_tag:
-                            new_tag = f"<{tag}><![CDATA[0]]></{tag}>"
-                        else:
-                            new_tag = f"<{tag}>0</{tag}>"
-                        
-                        # Replace the old tag content with the new one
-                        modified_line = modified_line.replace(full_tag, new_tag)
-                
-                out_file.write(modified_line)
-        
-        if not flag_tags_found:
-            found_tags = ', '.join([f'<{tag}>' for tag in flag_tags])
-            print(f"Warning: None of the pass flag tags ({found_tags}) found in the XML file.")
-            return False
-            
-        return True
-    except IOError as e:
-        print(f"Error processing file: {e}")
-        return False
-
-
-#######################
-# File Processor Module #
-#######################
-
-def read_xml_lines(file_path: str) -> Iterator[str]:
-    """
-    Read an XML file line by line to avoid loading large files into memory.
-    
-    Args:
-        file_path: Path to the XML file
-        
-    Yields:
-        Each line from the file
-    
-    Raises:
-        IOError: If there is an issue reading the file
-        SystemExit: If the file cannot be read
-    """
-    try:
-        with open(file_path, 'r') as file:
-            for line in file:
-                yield line
-    except IOError as e:
-        print(f"Error reading file: {e}")
-        sys.exit(1)
-
-
 #######################
 # Path Processor Module #
 #######################
 
-def extract_paths_from_line(line: str) -> List[Tuple[str, str, str]]:
-    """
-    Extract paths from specific tags in a line of XML.
-    
-    Args:
-        line: A line of XML text
-        
-    Returns:
-        List of tuples containing (tag_name, original_path, full_tag_content)
-    """
-    # List of tags we're looking for
-    tags = ['ppsDiskPathF', 'neDiskPathF', 'ppsSFTPPathF' , 'neSFTPClientPathF' , 'matcherPathF' , 'scPathF']
-    results = []
-    
-    # Process each tag type
-    for tag in tags:
-        # Pattern to match both regular content and CDATA sections:
-        # <tagname>path</tagname> or <tagname><![CDATA[path]]></tagname>
-        pattern = f"<{tag}>(?:<!\[CDATA\[(.*?)\]\]>|([^<]+))</{tag}>"
-        matches = re.finditer(pattern, line)
-        
-        for match in matches:
-            # The path is either in group 1 (CDATA) or group 2 (plain text)
-            path = match.group(1) if match.group(1) is not None else match.group(2)
-            # Get the full tag content (including tags)
-            full_tag = match.group(0)
-            if path:  # Only add if we found a path
-                results.append((tag, path, full_tag))
-    
-    return results
-
-
 def create_mkdir_commands(paths: List[Tuple[str, str]], prefix: str) -> List[str]:
     """
-    Create mkdir commands for each extracted path with the prefix.
+    Create one mkdir command for each unique extracted path with the prefix.
     
     Args:
         paths: List of (tag_name, path) tuples
         prefix: Path prefix to prepend
         
     Returns:
-        List of mkdir commands
-    """
-    commands = []
-    for _, path in paths:
-        # Combine the prefix with the path, ensuring there's no double slash
-        # Using os.path.join will handle path concatenation properly
-        combined_path = f"{prefix.rstrip('/')}/{path.lstrip('/')}"
-        print(f'mkdir -p "{combined_path}"')
-        
-        # Create the mkdir command with the -p option to create parent directories as needed
-        # We quote the path to handle spaces and special characters
-        commands.append(f'mkdir -p "{combined_path}"')
-        # print("Combined Path is", combined_path)
+        List of unique mkdir commands, in the order the paths were found
+    """
+    prefix = prefix.rstrip('/')
+    # Deduplicate the combined paths before formatting, so every command is built once
+    unique_paths = dict.fromkeys(f"{prefix}/{path.lstrip('/')}" for _, path in paths)
+    # The -p option creates parent directories as needed and the path is
+    # quoted to handle spaces and special characters
+    commands = [f'mkdir -p "{combined_path}"' for combined_path in unique_paths]
+    
+    # Echo all commands with one write instead of one print per path
+    if commands:
+        sys.stdout.write("\n".join(commands) + "\n")
     return commands
 
 
@@ -473,27 +474,24 @@ def create_mkdir_commands(paths: List[Tuple[str, str]], prefix: str) -> List[str
 # Output Generator Module #
 #######################
 
-def write_mkdir_script(commands: List[str], output_file: str = "commands_to_create_the_paths_manually") -> None:
+def write_mkdir_script(commands: List[str], output_file: str = "commands_to_create_the_paths_manually",
+                       duplicates_removed: int = 0) -> None:
     """
-    Write mkdir commands to an output file, removing duplicates.
+    Write mkdir commands to an output file in sorted order.
     
     Args:
-        commands: List of mkdir commands
+        commands: List of unique mkdir commands, as returned by create_mkdir_commands
         output_file: Name of the output file
+        duplicates_removed: Number of duplicate paths dropped while creating the commands
     """
     try:
-        # Use a set to remove duplicate commands
-        unique_commands = list(set(commands))
         # Sort the commands to ensure consistent output
-        unique_commands.sort()
+        sorted_commands = sorted(commands)
         
         with open(output_file, 'w') as file:
-            for command in unique_commands:
-                file.write(f"{command}\n")
+            file.writelines(f"{command}\n" for command in sorted_commands)
         
-        # Calculate how many duplicates were removed
-        duplicates_removed = len(commands) - len(unique_commands)
-        print(f"Successfully wrote {len(unique_commands)} mkdir commands to '{output_file}' (removed {duplicates_removed} duplicates)")
+        print(f"Successfully wrote {len(sorted_commands)} mkdir commands to '{output_file}' (removed {duplicates_removed} duplicates)")
     except IOError as e:
         print(f"Error writing to file: {e}")
 
@@ -537,49 +535,6 @@ def prompt_for_output_filename(default_name: str) -> str:
     return user_input
 
 
-def regenerate_xml(input_file: str, output_file: str, prefix: str) -> None:
-    """
-    Create a new XML file with updated paths.
-    
-    Args:
-        input_file: Path to the original XML file
-        output_file: Path for the regenerated XML file
-        prefix: Path prefix to prepend
-    """
-    try:
-        with open(output_file, 'w') as out_file:
-            # Process the XML file line by line
-            for line in read_xml_lines(input_file):
-                modified_line = line
-                
-                # Extract paths from this line
-                extractions = extract_paths_from_line(line)
-                
-                # If any paths were found, update them in the line
-                for tag, path, full_tag in extractions:
-                    # Create the new combined path
-                    combined_path = os.path.join(prefix, path.lstrip('/'))
-                    combined_path = combined_path.replace("\\", "/") 
-                    
-                    # Check if the original had CDATA
-                    if "<![CDATA[" in full_tag:
-                        # Create new tag content with the updated path wrapped in CDATA
-                        new_tag = f"<{tag}><![CDATA[{combined_path}]]></{tag}>"
-                    else:
-                        # Create new tag content with the updated path
-                        new_tag = f"<{tag}>{combined_path}</{tag}>"
-                    
-                    # Replace the old tag content with the new one
-                    # This preserves all other aspects of the XML structure
-                    modified_line = modified_line.replace(full_tag, new_tag)
-                
-                # Write the modified (or original) line to the output file
-                out_file.write(modified_line)
-                
-        print(f"Successfully generated modified XML file: '{output_file}'")
-    except IOError as e:
-        print(f"Error writing to file: {e}")
-        
 def prompt_for_default_stopped() -> bool:
     """
     Prompt the user to decide whether to set 'Default Stopped' to 'True' for all collectors.
@@ -591,57 +546,6 @@ def prompt_for_default_stopped() -> bool:
     return user_input == 'Y'
 
 
-def update_default_stopped_state(file_path: str, output_file: str) -> bool:
-    """
-    Update all <defaultStoppedState> tags in the XML file to contain value '1' (True).
-    
-    This function scans through an XML file, identifies all <defaultStoppedState> tags,
-    and changes their values to '1', indicating that collectors should be stopped by default.
-    
-    Args:
-        file_path: Path to the original XML file
-        output_file: Path for the modified XML file
-        
-    Returns:
-        bool: True if successful, False otherwise
-    """
-    try:
-        default_stopped_tags_found = False
-        
-        with open(file_path, 'r') as in_file, open(output_file, 'w') as out_file:
-            for line in in_file:
-                modified_line = line
-                
-                # Look for the defaultStoppedState tag
-                # Pattern to match both regular content and CDATA sections
-                stopped_pattern = r"<defaultStoppedState>(?:<!\[CDATA\[(.*?)\]\]>|([^<]+))?</defaultStoppedState>"
-                matches = re.finditer(stopped_pattern, line)
-                
-                for match in matches:
-                    default_stopped_tags_found = True
-                    # Get the full tag content
-                    full_tag = match.group(0)
-                    
-                    # Check if the original had CDATA
-                    if "<![CDATA[" in full_tag:
-                        new_tag = f"<defaultStoppedState><![CDATA[1]]></defaultStoppedState>"
-                    else:
-                        new_tag = f"<defaultStoppedState>1</defaultStoppedState>"
-                    
-                    # Replace the old tag content with the new one
-                    modified_line = modified_line.replace(full_tag, new_tag)
-                
-                out_file.write(modified_line)
-        
-        if not default_stopped_tags_found:
-            print("Warning: No <defaultStoppedState> tags found in the XML file.")
-            return False
-            
-        print("Successfully updated all collectors to 'Default Stopped' state.")
-        return True
-    except IOError as e:
-        print(f"Error processing file: {e}")
-        return False
 def display_xml_compatibility_warning() -> None:
     """
     Display a formal warning message about XML file compatibility requirements.
@@ -763,182 +667,121 @@ def main() -> None:
     default_output = get_output_filename(file_path)
     output_file = prompt_for_output_filename(default_output)
     
-    # Create a temporary working file for each operation
-    temp_file = f"{os.path.splitext(output_file)[0]}_temp{os.path.splitext(output_file)[1]}"
+    # Create a temporary working file so the output is only replaced once all operations succeeded
+    output_stem, output_ext = os.path.splitext(output_file)
+    temp_file = f"{output_stem}_temp{output_ext}"
     
-    # Start with the original file
-    current_input = file_path
+    # Gather the handlers of every selected operation so the file is rewritten in a single pass
+    handlers = {}
+    # Paths are collected while they are rewritten, so the file is not scanned twice
+    found_paths = []
     
     # Process paths if selected
     if "paths" in operations:
         prefix_path = prompt_for_prefix_path()
-        
-        # Process the XML file to collect all paths
-        all_paths = []
         print("\nProcessing XML file for paths...")
-        for line in read_xml_lines(current_input):
-            extractions = extract_paths_from_line(line)
-            all_paths.extend([(tag, path) for tag, path, _ in extractions])
-        
-        if not all_paths:
+        handlers.update(path_handlers(prefix_path, found_paths))
+    
+    # Update SFTP host if selected
+    if "host" in operations:
+        new_host = prompt_for_sftp_host()
+        print(f"\nUpdating SFTP host to: {new_host} (in both ppsSFTPHostF and neSFTPClientHostF tags)")
+        handlers.update(host_handlers(new_host))
+    
+    # Update SFTP username if selected
+    if "username" in operations:
+        new_username = prompt_for_sftp_username()
+        print(f"\nUpdating SFTP username to: {new_username} (in both ppsSFTPUserF and neSFTPClientUserF tags)")
+        handlers.update(username_handlers(new_username))
+    
+    # Update SFTP password if selected
+    if "password" in operations:
+        new_password = prompt_for_encrypted_password()
+        print("\nUpdating SFTP encrypted password...")
+        handlers.update(password_handlers(new_password))
+    
+    # Update SFTP pass flags if selected
+    if "flags" in operations:
+        print("\nUpdating all SFTP Password not required field to 0...")
+        handlers.update(pass_flag_handlers())
+    
+    # Update Default Stopped State if selected
+    if "default_stopped" in operations:
+        print("\nUpdating all collectors to 'Default Stopped' state...")
+        handlers.update(default_stopped_handlers())
+    
+    # Apply every selected operation in one pass over the XML file
+    try:
+        tag_counts = rewrite_xml_tags(file_path, temp_file, handlers)
+    except IOError as e:
+        print(f"Error processing file: {e}")
+        return
+    
+    # Report the outcome of each operation
+    if "paths" in operations:
+        path_count = sum(tag_counts[tag] for tag in PATH_TAGS)
+        if not path_count:
             print("No matching path tags found in the XML file.")
         else:
-            print(f"Found {len(all_paths)} paths to process.")
+            print(f"Found {path_count} paths to process.")
             
             # Create mkdir commands
-            mkdir_commands = create_mkdir_commands(all_paths, prefix_path)
+            mkdir_commands = create_mkdir_commands(found_paths, prefix_path)
             
             # Write the mkdir commands to a file
-            write_mkdir_script(mkdir_commands)
-            
-            # Generate the modified XML file
-            regenerate_xml(current_input, temp_file, prefix_path)
-            
-            # Update the current input for the next operation
-            current_input = temp_file
+            write_mkdir_script(mkdir_commands, duplicates_removed=path_count - len(mkdir_commands))
+            print("Successfully updated paths in the XML file.")
     
-    # Update SFTP host if selected
     if "host" in operations:
-        new_host = prompt_for_sftp_host()
-        print(f"\nUpdating SFTP host to: {new_host} (in both ppsSFTPHostF and neSFTPClientHostF tags)")
-        
-        # Create a new temporary file for this operation
-        temp_output = f"{os.path.splitext(output_file)[0]}_temp2{os.path.splitext(output_file)[1]}"
-        
-        success = update_sftp_host(current_input, temp_output, new_host)
-        
-        if success:
+        if tags_found(tag_counts, HOST_TAGS):
             print("SFTP host updated successfully.")
-            
-            # Remove the old temp file if it's not the original input
-            if current_input != file_path:
-                try:
-                    os.remove(current_input)
-                except OSError:
-                    pass
-                    
-            current_input = temp_output
         else:
             print("Failed to update SFTP host.")
     
-    # Update SFTP username if selected
     if "username" in operations:
-        new_username = prompt_for_sftp_username()
-        print(f"\nUpdating SFTP username to: {new_username} (in both ppsSFTPUserF and neSFTPClientUserF tags)")
-        
-        # Create a new temporary file for this operation
-        temp_output = f"{os.path.splitext(output_file)[0]}_temp3{os.path.splitext(output_file)[1]}"
-        
-        success = update_sftp_username(current_input, temp_output, new_username)
-        
-        if success:
+        if tags_found(tag_counts, USERNAME_TAGS):
             print("SFTP username updated successfully.")
-            
-            # Remove the old temp file if it's not the original input
-            if current_input != file_path:
-                try:
-                    os.remove(current_input)
-                except OSError:
-                    pass
-                    
-            current_input = temp_output
         else:
             print("Failed to update SFTP username.")
     
-    # Update SFTP password if selected
     if "password" in operations:
-        new_password = prompt_for_encrypted_password()
-        print("\nUpdating SFTP encrypted password...")
-        
-        # Create a new temporary file for this operation
-        temp_output = f"{os.path.splitext(output_file)[0]}_temp4{os.path.splitext(output_file)[1]}"
-        
-        success = update_sftp_password(current_input, temp_output, new_password)
-        
-        if success:
+        if tags_found(tag_counts, PASSWORD_TAGS):
             print("SFTP password updated successfully.")
-            
-            # Remove the old temp file if it's not the original input
-            if current_input != file_path:
-                try:
-                    os.remove(current_input)
-                except OSError:
-                    pass
-                    
-            current_input = temp_output
         else:
             print("Failed to update SFTP password.")
     
-    # Update SFTP pass flags if selected
     if "flags" in operations:
-        print("\nUpdating all SFTP Password not required field to 0...")
-        
-        # Create a new temporary file for this operation
-        temp_output = f"{os.path.splitext(output_file)[0]}_temp5{os.path.splitext(output_file)[1]}"
-        
-        success = update_sftp_pass_flags(current_input, temp_output)
-        
-        if success:
+        if tags_found(tag_counts, FLAG_TAGS):
             print("SFTP password not required field updated successfully to No.")
-            
-            # Remove the old temp file if it's not the original input
-            if current_input != file_path:
-                try:
-                    os.remove(current_input)
-                except OSError:
-                    pass
-                    
-            current_input = temp_output
         else:
             print("Failed to update password not required field to 'No'.")
     
-    # Update Default Stopped State if selected (new section)
     if "default_stopped" in operations:
-        print("\nUpdating all collectors to 'Default Stopped' state...")
-        
-        # Create a new temporary file for this operation
-        temp_output = f"{os.path.splitext(output_file)[0]}_temp6{os.path.splitext(output_file)[1]}"
-        
-        success = update_default_stopped_state(current_input, temp_output)
-        
-        if success:
+        if tags_found(tag_counts, DEFAULT_STOPPED_TAGS):
             print("Default Stopped state updated successfully to True for all collectors.")
-            
-            # Remove the old temp file if it's not the original input
-            if current_input != file_path:
-                try:
-                    os.remove(current_input)
-                except OSError:
-                    pass
-                    
-            current_input = temp_output
         else:
             print("Failed to update Default Stopped state.")
     
-    # Rename the final temporary file to the desired output file
-    if current_input != file_path:
+    # Rename the temporary file to the desired output file
+    if any(tag_counts.values()):
         try:
             # If the output file already exists (from a previous run), remove it
             if os.path.exists(output_file):
                 os.remove(output_file)
                 
-            os.rename(current_input, output_file)
+            os.rename(temp_file, output_file)
             print(f"\nFinal output saved to: '{output_file}'")
         except OSError as e:
             print(f"Error renaming final output file: {e}")
-            print(f"Final output is available at: '{current_input}'")
+            print(f"Final output is available at: '{temp_file}'")
     else:
-        # No operations modified the file
-        print("\nNo modifications were made to the XML file.")
-    
-    # Clean up any temporary files that might have been left behind
-    for i in range(1, 7):  # Now check up to _temp6 since we added another operation
-        temp_path = f"{os.path.splitext(output_file)[0]}_temp{i}{os.path.splitext(output_file)[1]}"
-        if os.path.exists(temp_path):
+        # No operations modified the file, so the temporary copy is not needed
+        if os.path.exists(temp_file):
             try:
-                os.remove(temp_path)
+                os.remove(temp_file)
             except OSError:
                 pass
+        print("\nNo modifications were made to the XML file.")
     
     print("\nProcessing complete!")
     
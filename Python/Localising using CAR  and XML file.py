@@ -74,14 +74,21 @@ Documentation: [To be updated]
 
 
 import os
+import posixpath
 import sys
 import re
+import errno
 import ipaddress
-from typing import List, Tuple, Optional, Iterator
+from typing import Callable, Dict, Iterable, List, Set, Tuple, Optional
 import shutil
+import stat
+import functools
 import tempfile
 import zipfile
 import logging
+import logging.handlers
+import queue
+import atexit
 from datetime import datetime
 import webbrowser
 import urllib.parse
@@ -90,6 +97,229 @@ import getpass
 import socket
 
 
+# Translation table replacing characters that are not allowed in log and
+# command file names with '_'
+_UNSAFE_FS_CHARS = str.maketrans(dict.fromkeys('\\/*?:"<>|', '_'))
+
+# First <name> tag of an export, plain or CDATA
+_NAME_TAG_RE = re.compile(r"<name>(?:<!\[CDATA\[(.*?)\]\]>|([^<\n]+))</name>")
+
+# "_modified" suffix added to the processed XML, only matched right before the extension
+_MODIFIED_SUFFIX = re.compile(r'_modified(?=\.xml$)', re.IGNORECASE)
+
+
+#######################
+# Tag Patterns Module #
+#######################
+
+# Tags holding filesystem paths that get the user-defined prefix
+PATH_TAGS = ('ppsDiskPathF', 'neDiskPathF', 'ppsSFTPPathF', 'neSFTPClientPathF', 'matcherPathF', 'scPathF')
+HOST_TAGS = ('ppsSFTPHostF', 'neSFTPClientHostF')
+USERNAME_TAGS = ('ppsSFTPUserF', 'neSFTPClientUserF')
+# List of password-related tags to update (add more tags here in the future)
+PASSWORD_TAGS = ('ppsSFTPPasswordF', 'neSFTPClientPasswordF')
+# List of pass flag related tags to update (add more tags here in the future)
+FLAG_TAGS = ('ppsSFTPPassFlagF', 'neSFTPClientPassFlagF')
+DEFAULT_STOPPED_TAGS = ('defaultStoppedState',)
+
+
+def compile_tag_group_pattern(tags: Tuple[str, ...]) -> "re.Pattern":
+    """
+    Compile one pattern matching any tag of an operation, with named groups.
+    
+    The matched tag name is captured in 'tag' (and required again for the
+    closing tag), CDATA content in 'cdata' and plain content in 'plain', so a
+    single substitution serves every tag touched by the selected updates.
+    Plain content may not contain a newline, so a match never spans lines
+    even when the pattern is applied to the whole file at once. Empty tags
+    (<tag></tag>) match too, with neither content group set.
+    
+    Args:
+        tags: Tag names to match
+        
+    Returns:
+        re.Pattern: The compiled pattern
+    """
+    return re.compile(
+        fr"<(?P<tag>{'|'.join(tags)})>(?:<!\[CDATA\[(?P<cdata>.*?)\]\]>|(?P<plain>[^<\n]+))?</(?P=tag)>"
+    )
+
+
+# Host and path tags are only rewritten when they have content
+CONTENT_REQUIRED_TAGS = frozenset(HOST_TAGS + PATH_TAGS)
+
+# A handler receives the current tag value (None for an empty tag) and returns
+# the new value, or None to leave the tag untouched
+TagHandler = Callable[[Optional[str]], Optional[str]]
+
+
+#######################
+# Tag Rewrite Module #
+#######################
+
+def transform_xml_content(xml_content: str, handlers: Dict[str, TagHandler]) -> Tuple[str, Dict[str, int]]:
+    """
+    Apply every selected tag rewrite to XML content in a single pass.
+    
+    The content is scanned as one buffer rather than line by line, with a
+    single alternation over every handled tag; the substitution callback
+    dispatches on the matched tag name and keeps CDATA wrapping intact.
+    Unchanged text is never copied into per-line strings.
+    
+    Args:
+        xml_content: Content of the XML file
+        handlers: Mapping of tag name to the handler producing its new value
+        
+    Returns:
+        Tuple[str, Dict[str, int]]: The modified content and the number of
+            rewritten occurrences per handled tag
+    """
+    tag_counts = dict.fromkeys(handlers, 0)
+    # Replacement tags rendered so far, keyed by (tag, new value, CDATA);
+    # the fixed-value updates only ever need two strings per tag
+    rendered: Dict[Tuple[str, str, bool], str] = {}
+    
+    def replace(match: "re.Match") -> str:
+        tag = match.group('tag')
+        
+        # The value is either in the CDATA group or the plain text group
+        cdata = match.group('cdata')
+        value = cdata if cdata is not None else match.group('plain')
+        if value is None and tag in CONTENT_REQUIRED_TAGS:
+            return match.group(0)
+        
+        new_value = handlers[tag](value)
+        if new_value is None:
+            return match.group(0)
+        
+        tag_counts[tag] += 1
+        key = (tag, new_value, cdata is not None)
+        new_tag = rendered.get(key)
+        if new_tag is None:
+            if cdata is not None:
+                new_tag = f"<{tag}><![CDATA[{new_value}]]></{tag}>"
+            else:
+                new_tag = f"<{tag}>{new_value}</{tag}>"
+            rendered[key] = new_tag
+        return new_tag
+    
+    # Skip the regex when none of the handled opening tags occurs in the file;
+    # the compiled alternation is reused from the re module's pattern cache
+    if any(f"<{tag}>" in xml_content for tag in handlers):
+        xml_content = compile_tag_group_pattern(tuple(handlers)).sub(replace, xml_content)
+    
+    return xml_content, tag_counts
+
+
+def tags_found(tag_counts: Dict[str, int], tags: Tuple[str, ...]) -> bool:
+    """
+    Check whether any of the given tags was rewritten, warning the user if not.
+    
+    Args:
+        tag_counts: Rewrite counts as returned by transform_xml_content
+        tags: Tags belonging to one operation
+        
+    Returns:
+        bool: True if at least one of the tags was rewritten, False otherwise
+    """
+    if any(tag_counts.get(tag) for tag in tags):
+        return True
+    
+    tag_list = ' or '.join(f'<{tag}>' for tag in tags)
+    logger.warning(f"No {tag_list} tags found in the XML file.")
+    print(f"Warning: No {tag_list} tags found in the XML file.")
+    return False
+
+
+def path_handlers(prefix: str, found_paths: Optional[List[Tuple[str, str]]] = None) -> Dict[str, TagHandler]:
+    """
+    Build handlers that prepend the prefix to every non-empty path tag.
+    
+    Args:
+        prefix: Path prefix to prepend
+        found_paths: Optional list receiving (tag_name, original_path) for each
+            path rewritten, so the paths are collected in the same pass
+        
+    Returns:
+        Dict[str, TagHandler]: Handler for each tag of the operation
+    """
+    # Same result as os.path.join(prefix, relative_path), computed once
+    prefix_dir = prefix if not prefix or prefix.endswith('/') else prefix + '/'
+    
+    def make_handler(tag: str) -> TagHandler:
+        def prepend_prefix(path: Optional[str]) -> Optional[str]:
+            if not path:
+                logger.warning(f"Tag <{tag}> found but it is empty or malformed")
+                return None
+            if found_paths is not None:
+                found_paths.append((tag, path))
+            # Create the new combined path
+            combined_path = prefix_dir + path.lstrip('/')
+            # Backslashes can only come from the XML value itself
+            return combined_path.replace("\\", "/")
+        return prepend_prefix
+    return {tag: make_handler(tag) for tag in PATH_TAGS}
+
+
+def host_handlers(new_host: str) -> Dict[str, TagHandler]:
+    """
+    Build handlers that replace every SFTP host tag.
+    
+    Args:
+        new_host: New SFTP host IP address
+        
+    Returns:
+        Dict[str, TagHandler]: Handler for each tag of the operation
+    """
+    return dict.fromkeys(HOST_TAGS, lambda value: new_host)
+
+
+def username_handlers(new_username: str) -> Dict[str, TagHandler]:
+    """
+    Build handlers that replace every SFTP username tag.
+    
+    Args:
+        new_username: New SFTP username
+        
+    Returns:
+        Dict[str, TagHandler]: Handler for each tag of the operation
+    """
+    return dict.fromkeys(USERNAME_TAGS, lambda value: new_username)
+
+
+def password_handlers(new_password: str) -> Dict[str, TagHandler]:
+    """
+    Build handlers that replace every SFTP password tag.
+    
+    Args:
+        new_password: New encrypted SFTP password
+        
+    Returns:
+        Dict[str, TagHandler]: Handler for each tag of the operation
+    """
+    return dict.fromkeys(PASSWORD_TAGS, lambda value: new_password)
+
+
+def pass_flag_handlers() -> Dict[str, TagHandler]:
+    """
+    Build handlers that set every SFTP pass flag tag to 0.
+    
+    Returns:
+        Dict[str, TagHandler]: Handler for each tag of the operation
+    """
+    return dict.fromkeys(FLAG_TAGS, lambda value: '0')
+
+
+def default_stopped_handlers() -> Dict[str, TagHandler]:
+    """
+    Build handlers that set every defaultStoppedState tag to 1 (True).
+    
+    Returns:
+        Dict[str, TagHandler]: Handler for each tag of the operation
+    """
+    return dict.fromkeys(DEFAULT_STOPPED_TAGS, lambda value: '1')
+
+
 ###################################
 # Winow closing with grace Module #
 ###################################
@@ -97,6 +327,44 @@ import socket
 import sys
 import time
 
+# Pulsing dots shown after the countdown text, one frame every COUNTDOWN_FRAME_SECONDS
+COUNTDOWN_PHASES = (".  ", ".. ", "...", " ..", "  .", "   ")
+COUNTDOWN_FRAME_SECONDS = 0.2
+COUNTDOWN_LINE_WIDTH = 60
+COUNTDOWN_PAD = " " * 4
+COUNTDOWN_CLOSING_LINE = f"\r{COUNTDOWN_PAD}\033[1mClosing now...{' ' * (COUNTDOWN_LINE_WIDTH - len('Closing now...'))}\033[0m\n"
+
+
+def run_closing_countdown(countdown_seconds: int) -> None:
+    """
+    Show the pulsing "Closing in N second(s)" animation followed by "Closing now...".
+    
+    Frames are scheduled against time.monotonic() so scheduler jitter does not
+    stretch the countdown beyond its intended length.
+    
+    Args:
+        countdown_seconds: Number of seconds to count down from
+    """
+    width = COUNTDOWN_LINE_WIDTH + len(COUNTDOWN_PAD)
+    write = sys.stdout.write
+    flush = sys.stdout.flush
+    next_frame = time.monotonic()
+    
+    for remaining in range(countdown_seconds, 0, -1):
+        # Build this second's frames once instead of formatting inside the frame loop
+        text = f"{COUNTDOWN_PAD}Closing in {remaining} second(s)"
+        frames = [f"\r\033[2m{text + phase:<{width}}\033[0m" for phase in COUNTDOWN_PHASES]
+        for frame in frames:
+            write(frame)
+            flush()
+            next_frame += COUNTDOWN_FRAME_SECONDS
+            delay = next_frame - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+    
+    write(COUNTDOWN_CLOSING_LINE)
+
+
 def handle_error_with_countdown(error_message: str, countdown_seconds: int = 5) -> None:
     """
     Display a professional animated error message with countdown before exiting.
@@ -117,7 +385,6 @@ def handle_error_with_countdown(error_message: str, countdown_seconds: int = 5)
     BOLD = "\033[1m"
 
     line_width = 60
-    pad = " " * 4
 
     # Header block
     print("\n╔" + "═" * line_width + "╗")
@@ -129,14 +396,7 @@ def handle_error_with_countdown(error_message: str, countdown_seconds: int = 5)
     print(f"{DIM}User: {user} | Host: {host} | Time: {now}{RESET}\n")
     
     # Countdown with animated pulsing effect
-    for remaining in range(countdown_seconds, 0, -1):
-        for phase in [".  ", ".. ", "...", " ..", "  .", "   "]:
-            display = f"{pad}Closing in {remaining} second(s){phase}"
-            sys.stdout.write(f"\r{DIM}{display:<{line_width + len(pad)}}{RESET}")
-            sys.stdout.flush()
-            time.sleep(0.2)
-
-    sys.stdout.write(f"\r{pad}{BOLD}Closing now...{' ' * (line_width - len('Closing now...'))}{RESET}\n")
+    run_closing_countdown(countdown_seconds)
     sys.exit(1)  # Exit with error code
 
 
@@ -152,7 +412,6 @@ def handle_user_cancellation(message: str = "Operation cancelled by user.", coun
     BOLD = "\033[1m"
 
     line_width = 60
-    pad = " " * 4
 
     # Title block
     print("\n╔" + "═" * line_width + "╗")
@@ -163,14 +422,7 @@ def handle_user_cancellation(message: str = "Operation cancelled by user.", coun
     print(f"{DIM}Please wait while the application exits safely.{RESET}\n")
 
     # Countdown with elegant pulsing dots
-    for remaining in range(countdown_seconds, 0, -1):
-        for phase in [".  ", ".. ", "...", " ..", "  .", "   "]:
-            display = f"{pad}Closing in {remaining} second(s){phase}"
-            sys.stdout.write(f"\r{DIM}{display:<{line_width + len(pad)}}{RESET}")
-            sys.stdout.flush()
-            time.sleep(0.2)
-
-    sys.stdout.write(f"\r{pad}{BOLD}Closing now...{' ' * (line_width - len('Closing now...'))}{RESET}\n")
+    run_closing_countdown(countdown_seconds)
     sys.exit(0)
     
     
@@ -189,7 +441,6 @@ def handle_sucessful_completion(message: str = "Operation completed successfully
     BOLD = "\033[1m"
 
     line_width = 60
-    pad = " " * 4
 
     # Success block
     print("\n╔" + "═" * line_width + "╗")
@@ -200,14 +451,7 @@ def handle_sucessful_completion(message: str = "Operation completed successfully
     print(f"{DIM}Application will close shortly. Please wait...{RESET}\n")
 
     # Countdown with pulsing dots
-    for remaining in range(countdown_seconds, 0, -1):
-        for phase in [".  ", ".. ", "...", " ..", "  .", "   "]:
-            display = f"{pad}Closing in {remaining} second(s){phase}"
-            sys.stdout.write(f"\r{DIM}{display:<{line_width + len(pad)}}{RESET}")
-            sys.stdout.flush()
-            time.sleep(0.2)
-
-    sys.stdout.write(f"\r{pad}{BOLD}Closing now...{' ' * (line_width - len('Closing now...'))}{RESET}\n")
+    run_closing_countdown(countdown_seconds)
     sys.exit(0)
 
 ######################
@@ -252,18 +496,44 @@ def log_car_processing_details(temp_dir: str, extracted_xml: str, modified_xml:
     logger.info("=" * 50)
 
 
+# Background listener that writes queued log records to the log file/console
+log_listener = None
+# Path of the current session's log file, set by setup_logging (None without one)
+log_file_path: Optional[str] = None
+
+
+def stop_log_listener() -> None:
+    """
+    Stop the background log listener, writing out any records still queued.
+    """
+    global log_listener
+    if log_listener is not None:
+        log_listener.stop()
+        for handler in log_listener.handlers:
+            handler.close()
+        log_listener = None
+
+
+atexit.register(stop_log_listener)
+
+
 def setup_logging(file_path: str = '', log_level=logging.INFO, log_to_file=True, console_output=False):
     """
     Sets up logging configuration for the application.
     
+    Records are put on an in-memory queue and written by a background
+    QueueListener, so logging calls in the CAR extract/cleanup loops do not
+    wait on file writes.
+    
     Args:
         log_level: The logging level (default: logging.INFO)
         log_to_file: Whether to log to a file (default: True)
         console_output: Whether to show logs in console (default: False)
     
     Returns:
-        The configured logger instance
+        The configured logger instance; the log file path is kept in log_file_path
     """
+    global log_listener, log_file_path
     
     # Get user, host, and timestamp info
     user = getpass.getuser()
@@ -271,20 +541,28 @@ def setup_logging(file_path: str = '', log_level=logging.INFO, log_to_file=True,
     now = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
     
     # Create logs directory if it doesn't exist
-    if log_to_file and not os.path.exists('logs'):
-        os.makedirs('logs')
+    if log_to_file:
+        os.makedirs('logs', exist_ok=True)
     
     # Configure root logger
     logger = logging.getLogger()
     logger.setLevel(log_level)
     
-    # Clear any existing handlers
+    # Clear any existing handlers and flush the previous session's queue
     for handler in logger.handlers[:]:
         logger.removeHandler(handler)
+        handler.close()
+    stop_log_listener()
+    log_file_path = None
     
     # Create formatter
     formatter = logging.Formatter('%(asctime)s - %(levelname)s - %(message)s')
     
+    # Handlers driven by the background listener
+    output_handlers = []
+    log_queue = queue.SimpleQueue()
+    logger.addHandler(logging.handlers.QueueHandler(log_queue))
+    
     # Add file handler if requested
     if log_to_file:
         # Create log filename based on input file if provided
@@ -297,7 +575,7 @@ def setup_logging(file_path: str = '', log_level=logging.INFO, log_to_file=True,
                 name = os.path.splitext(os.path.basename(file_path))[0]
             
             # Clean the name to be filesystem-safe
-            name = re.sub(r'[\\/*?:"<>|]', "_", name).strip()
+            name = name.translate(_UNSAFE_FS_CHARS).strip()
             # Create unique log filename with timestamp
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
             log_file = os.path.join('logs', f'{name}_{timestamp}.log')
@@ -308,17 +586,23 @@ def setup_logging(file_path: str = '', log_level=logging.INFO, log_to_file=True,
             log_file = os.path.join('logs', f'xml_processor_{timestamp}.log')
         
         file_handler = logging.FileHandler(log_file)
+        log_file_path = file_handler.baseFilename
         file_handler.setLevel(log_level)
         file_handler.setFormatter(formatter)
-        logger.addHandler(file_handler)
-        logger.info(f"Session started - User: {user} | Host: {host} | Time: {now}")
+        output_handlers.append(file_handler)
         
     # Add console handler only if console output is requested
     if console_output:
         console_handler = logging.StreamHandler()
         console_handler.setLevel(log_level)
         console_handler.setFormatter(formatter)
-        logger.addHandler(console_handler)
+        output_handlers.append(console_handler)
+    
+    log_listener = logging.handlers.QueueListener(log_queue, *output_handlers, respect_handler_level=True)
+    log_listener.start()
+    
+    if log_to_file:
+        logger.info(f"Session started - User: {user} | Host: {host} | Time: {now}")
     
     return logger
 
@@ -363,14 +647,8 @@ def log_summary(operations_performed):
     # Brief summary to console
     print(f"\nDetailed log saved to log file")
     print("\nProcessing complete!")
-    
-    logger.info("=" * 50)
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(levelname)s - %(message)s'
-)
+# Module logger; records propagate to the root handlers installed by setup_logging
 logger = logging.getLogger(__name__)
 
 #############################
@@ -405,9 +683,47 @@ def check_file_extension(file_path: str) -> str:
 # .CAR file Handler Module #
 ############################
 
+# Copy buffer used when streaming files into CAR archives (1 MiB)
+CAR_COPY_BUFFER_SIZE = 1 << 20
+
+# Final CARs are only re-read by BLDM, so favour packing speed over ratio.
+# Deflate is kept rather than zstd so the archive stays readable by ordinary zip readers.
+CAR_COMPRESSION = zipfile.ZIP_DEFLATED
+CAR_COMPRESS_LEVEL = 1
+
+# Environment variable that overrides where CAR files are extracted
+CAR_TEMP_DIR_ENV = 'BLDM_TMPDIR'
+
+
+@functools.lru_cache(maxsize=None)
+def get_fast_temp_root() -> str:
+    """
+    Get the directory under which CAR files are extracted.
+    
+    Uses the BLDM_TMPDIR environment variable if set, otherwise the RAM-backed
+    /dev/shm when it is available and writable (Linux), so extraction and
+    repackaging do not hit the disk. Falls back to the system temp directory.
+    The choice is made once per run, so /dev/shm is probed only on the first call.
+    
+    Returns:
+        str: Directory in which to create temporary extraction folders
+    """
+    override = os.environ.get(CAR_TEMP_DIR_ENV)
+    if override:
+        return override
+    
+    if os.path.isdir('/dev/shm') and os.access('/dev/shm', os.W_OK):
+        return '/dev/shm'
+    
+    return tempfile.gettempdir()
+
+
 def extract_car_file(car_path: str) -> Tuple[str, str]:
     """
-    Extract the contents of a .car file to a temporary directory.
+    Extract the XML file to process from a .car file to a temporary directory.
+    
+    Only the selected XML is written to disk; the other entries are copied
+    straight from the original archive when the CAR is repackaged.
     
     Args:
         car_path: Path to the .car file
@@ -416,32 +732,28 @@ def extract_car_file(car_path: str) -> Tuple[str, str]:
         Tuple[str, str]: Path to the temp directory and the extracted XML file path
     """
     # Create a temporary directory
-    temp_dir = tempfile.mkdtemp(prefix="car_extract_")
+    temp_dir = tempfile.mkdtemp(prefix="car_extract_", dir=get_fast_temp_root())
     logger.info(f"[INIT] Temporary extraction directory created: {temp_dir}")
     
     try:
-        # Extract the .car file (which is essentially a ZIP file)
+        # The .car file is essentially a ZIP file; select the alphabetically
+        # first XML entry from its name list and extract only that one. Names
+        # are compared with the local separator, like the extracted paths they
+        # replace, so Windows still picks the same XML as before
         with zipfile.ZipFile(car_path, 'r') as zip_ref:
-            zip_ref.extractall(temp_dir)
-            logger.info(f"[EXTRACT] Successfully extracted '{car_path}' to '{temp_dir}'")
-        
-        # Find all XML files in the extracted directory
-        xml_files = []
-        for root, _, files in os.walk(temp_dir):
-            for file in files:
-                if file.lower().endswith('.xml'):
-                    xml_files.append(os.path.join(root, file))
-        
-        if not xml_files:
-            logger.error("[ERROR] No XML files found in the extracted CAR archive.")
-            error_msg = 'No XML files found in the extracted CAR archive.'
-            shutil.rmtree(temp_dir)
-            handle_error_with_countdown(error_msg)
-            raise
-        
-        # Sort alphabetically and select the first one
-        xml_files.sort()
-        selected_xml = xml_files[0]
+            xml_name = min((info.filename for info in zip_ref.infolist()
+                            if not info.is_dir() and info.filename.lower().endswith('.xml')),
+                           key=lambda name: name.replace('/', os.sep), default=None)
+            
+            if xml_name is None:
+                logger.error("[ERROR] No XML files found in the extracted CAR archive.")
+                error_msg = 'No XML files found in the extracted CAR archive.'
+                shutil.rmtree(temp_dir)
+                handle_error_with_countdown(error_msg)
+                raise
+            
+            selected_xml = zip_ref.extract(xml_name, temp_dir)
+            logger.info(f"[EXTRACT] Successfully extracted '{xml_name}' from '{car_path}' to '{temp_dir}'")
         
         logger.info(f"[SELECT] Using XML file: {selected_xml}")
         return temp_dir, selected_xml
@@ -452,120 +764,46 @@ def extract_car_file(car_path: str) -> Tuple[str, str]:
         shutil.rmtree(temp_dir)
         handle_error_with_countdown(error_msg)
         raise
-        
-def rename_modified_xml_files(temp_dir: str) -> None:
+
+
+def apply_car_compression(zinfo: zipfile.ZipInfo, zipf: zipfile.ZipFile) -> None:
     """
-    Rename XML files by removing "_modified" from their filenames.
+    Give an entry the compression method and level of the archive it is written to.
     
-    This function walks through the temporary directory, finds all XML files
-    with "_modified" in their names, and renames them by removing the "_modified" suffix.
+    ZipFile.open does not apply the archive's compresslevel to a ZipInfo it is
+    given, so the level is set on the entry the way ZipFile.write does. There is
+    no public API for this: the attribute is a CPython internal, used here on
+    purpose. Python 3.13 renamed it to compress_level and keeps _compresslevel
+    only as an alias, so the new name is preferred where it exists.
     
     Args:
-        temp_dir: Path to the temporary directory with extracted contents
+        zinfo: Entry about to be opened for writing
+        zipf: CAR archive opened for writing
     """
-    modified_files_renamed = 0
-    
-    try:
-        for root, _, files in os.walk(temp_dir):
-            for file in files:
-                if file.lower().endswith('.xml') and "_modified" in file:
-                    old_path = os.path.join(root, file)
-                    # Create new filename by removing "_modified" from the name
-                    new_filename = file.replace("_modified", "")
-                    new_path = os.path.join(root, new_filename)
-                    
-                    try:
-                        os.rename(old_path, new_path)
-                        modified_files_renamed += 1
-                        logger.info(f"Renamed file from '{file}' to '{new_filename}'")
-                    except OSError as e:
-                        logger.error(f"Error renaming file '{file}': {e}")
-        
-        logger.info(f"\nRenamed Files Summary:")
-        logger.info(f"  XML files renamed (removed '_modified'): {modified_files_renamed}")
-        
-    except Exception as e:
-        logger.error(f"Error while renaming modified XML files: {e}")
-        
-        
-def delete_original_xml_from_car(temp_dir: str, xml_path: str) -> bool:
-    """
-    Delete the original XML file from the extracted CAR contents before repackaging.
-    
-    Args:
-        temp_dir: Path to the temporary directory with extracted contents
-        xml_path: Path to the original XML file to be deleted
-        
-    Returns:
-        bool: True if successful, False otherwise
-    """
-    
-    try:
-        if os.path.exists(xml_path):
-            os.remove(xml_path)
-            logger.info(f"Deleted original XML file: {xml_path}")
-            
-            # Verify the file was actually deleted
-            if not os.path.exists(xml_path):
-                return True
-            else:
-                logger.error(f"Failed to delete original XML file: {xml_path}")
-                return False
-        else:
-            logger.warning(f"Original XML file not found for deletion: {xml_path}")
-            return False
-            
-    except OSError as e:
-        logger.error(f"Error deleting original XML file: {e}")
-        return False
+    zinfo.compress_type = zipf.compression
+    if hasattr(zinfo, 'compress_level'):
+        zinfo.compress_level = zipf.compresslevel
+    else:
+        zinfo._compresslevel = zipf.compresslevel
 
-def repackage_car_file(temp_dir: str, original_car_path: str, xml_path: str, modified_xml_path: str) -> str:
+
+def add_file_to_car(zipf: zipfile.ZipFile, file_path: str, arcname: str) -> None:
     """
-    Repackage the modified XML file back into a new CAR archive.
+    Stream a file into an open CAR archive using a 1 MiB copy buffer.
+    
+    ZipFile.write copies in 8 KiB chunks; large XML exports are copied with far
+    fewer read/write calls this way. File metadata is kept as ZipFile.write would.
     
     Args:
-        temp_dir: Path to the temporary directory with extracted contents
-        original_car_path: Path to the original .car file
-        xml_path: Path to the original XML file (to be removed)
-        modified_xml_path: Path to the modified XML file
-        
-    Returns:
-        str: Path to the new CAR file
+        zipf: CAR archive opened for writing
+        file_path: Path of the file to add
+        arcname: Path of the entry inside the archive
     """
-    # Create output filename
-    base_name = os.path.splitext(original_car_path)[0]
-    new_car_path = f"{base_name}_modified.car"
-    
-    # Calculate relative path of the XML file within the archive
-    rel_xml_path = os.path.relpath(xml_path, temp_dir)
-    
-    try:
-        # First, delete the original XML file from the extracted contents
-        delete_success = delete_original_xml_from_car(temp_dir, xml_path)
-        if not delete_success:
-            logger.warning("Failed to delete original XML file, but continuing with repackaging")
-        
-        # Copy the modified XML file to the correct location in the temp directory
-        # This will place it where the original XML file was
-        shutil.copy2(modified_xml_path, xml_path)
-        logger.info(f"Placed modified XML at: {xml_path}")
-        
-        # Create a new CAR file
-        with zipfile.ZipFile(new_car_path, 'w', zipfile.ZIP_DEFLATED) as zipf:
-            # Add all files from the temp directory to the zip
-            for root, _, files in os.walk(temp_dir):
-                for file in files:
-                    file_path = os.path.join(root, file)
-                    # Calculate path in the zip file
-                    arcname = os.path.relpath(file_path, temp_dir)
-                    zipf.write(file_path, arcname)
-        
-        logger.info(f"Created modified CAR archive: {new_car_path}")
-        return new_car_path
-        
-    except Exception as e:
-        logger.error(f"Error repackaging CAR file: {e}")
-        return ""
+    zinfo = zipfile.ZipInfo.from_file(file_path, arcname)
+    apply_car_compression(zinfo, zipf)
+    with open(file_path, 'rb') as src, zipf.open(zinfo, 'w') as dst:
+        shutil.copyfileobj(src, dst, CAR_COPY_BUFFER_SIZE)
+
 
 def cleanup_temp_directory(temp_dir: str) -> None:
     """
@@ -592,84 +830,161 @@ def process_car_file(car_path: str) -> Tuple[str, str, str]:
     """
     temp_dir, xml_path = extract_car_file(car_path)
     
-    # Generate output path for modified XML
-    xml_dir = os.path.dirname(xml_path)
-    xml_filename = os.path.basename(xml_path)
-    base_name = os.path.splitext(xml_filename)[0]
-    modified_xml_path = os.path.join(xml_dir, f"{base_name}_modified.xml")
+    # Generate output path for modified XML next to the original
+    base_name = os.path.splitext(xml_path)[0]
+    modified_xml_path = f"{base_name}_modified.xml"
     
     return temp_dir, xml_path, modified_xml_path
 
-def cleanup_and_repackage_car(car_path: str) -> str:
+
+def copy_cleaned_car_entries(zin: zipfile.ZipFile, zout: zipfile.ZipFile, skip_names: Iterable[str] = (),
+                             extra_files: Iterable[Tuple[str, str]] = ()) -> None:
+    """
+    Copy the original CAR archive into the final CAR in a single pass over its entries.
+    
+    XML files without "_modified" in their name are left out of the archive, and
+    "_modified" XML files are added under their name with the suffix removed, so
+    nothing has to be extracted, deleted or renamed on disk before zipping.
+    
+    Args:
+        zin: Source CAR archive opened for reading
+        zout: CAR archive opened for writing
+        skip_names: Entries of the source archive to leave out
+        extra_files: (file path, archive name) pairs added from disk after the
+            archive entries, under the same naming rules
+            
+    Raises:
+        OSError: If a file cannot be read or the archive cannot be written
+    """
+    xml_files_found = 0
+    xml_files_skipped = []
+    modified_files_renamed = 0
+    skip_names = frozenset(skip_names)
+    
+    def cleaned_arcname(arcname: str) -> Optional[str]:
+        # Name of the entry in the final .car, or None to leave it out
+        nonlocal xml_files_found, modified_files_renamed
+        file = posixpath.basename(arcname)
+        if not file.lower().endswith('.xml'):
+            return arcname
+        xml_files_found += 1
+        
+        # Non-modified XML files are simply not added to the final .car
+        if "_modified" not in file:
+            xml_files_skipped.append(file)
+            # Per-file details are debug only; the summary below is logged at INFO
+            logger.debug("Deleted non-modified XML file in the final .car: %s", file)
+            return None
+        
+        archive_name = _MODIFIED_SUFFIX.sub("", file, count=1)
+        if archive_name == file:
+            return arcname
+        modified_files_renamed += 1
+        logger.debug("Renamed file from '%s' to '%s'", file, archive_name)
+        return posixpath.join(posixpath.dirname(arcname), archive_name)
+    
+    for info in zin.infolist():
+        if info.is_dir() or info.filename in skip_names:
+            continue
+        arcname = cleaned_arcname(info.filename)
+        if arcname is not None:
+            copy_car_entry(zin, info, zout, arcname)
+    
+    for file_path, arcname in extra_files:
+        arcname = cleaned_arcname(arcname)
+        if arcname is not None:
+            add_file_to_car(zout, file_path, arcname)
+    
+    # Report what was found and left out
+    logger.info(f"\nCleanup Summary:")
+    logger.info(f"  Total XML files found: {xml_files_found}")
+    logger.info(f"  Non-modified XML files deleted: {len(xml_files_skipped)}")
+    logger.info(f"  Remaining XML files: {xml_files_found - len(xml_files_skipped)}")
+    logger.info(f"\nRenamed Files Summary:")
+    logger.info(f"  XML files renamed (removed '_modified'): {modified_files_renamed}")
+    
+    if xml_files_skipped:
+        deleted_files = ', '.join(xml_files_skipped)
+        logger.info(f"  Deleted files: {deleted_files}")
+        print(f"  Deleted files: {deleted_files}")
+
+
+@functools.lru_cache(maxsize=None)
+def default_file_mode() -> int:
+    """
+    Return the permission bits a newly created file gets under the current umask.
+    
+    Returns:
+        int: 0o666 with the umask bits cleared
+    """
+    # os.umask can only be read by setting it, so put the old value back at once
+    umask = os.umask(0)
+    os.umask(umask)
+    return 0o666 & ~umask
+
+
+def copy_car_entry(zin: zipfile.ZipFile, info: zipfile.ZipInfo, zout: zipfile.ZipFile, arcname: str) -> None:
     """
-    Extract CAR file, remove non-modified XML files, rename remaining XML files by removing "_modified", and repackage.
-    This function performs a final cleanup by:
-    1. Extracting the CAR file to a temporary directory
-    2. Finding all XML files in the extracted contents
-    3. Deleting XML files that don't have "_modified" in their name
-    4. Renaming remaining XML files by removing "_modified" from their names
-    5. Repackaging the remaining files into a new CAR file
+    Stream one entry of an open CAR archive into another under a new name.
+    
+    The entry keeps its timestamp and attributes and is recompressed with the
+    output archive's compression, using a 1 MiB copy buffer. The attributes are
+    only meaningful together with the system that wrote them (DOS attributes
+    or Unix mode bits), so that is copied as well. An entry without attributes
+    is stored as a regular file with the default permissions for new files,
+    as it was when the extracted file was zipped again.
+    
+    Args:
+        zin: Source CAR archive opened for reading
+        info: Entry of the source archive to copy
+        zout: CAR archive opened for writing
+        arcname: Path of the entry inside the output archive
+    """
+    zinfo = zipfile.ZipInfo(arcname, info.date_time)
+    if info.external_attr:
+        zinfo.create_system = info.create_system
+        zinfo.external_attr = info.external_attr
+    else:
+        zinfo.external_attr = (stat.S_IFREG | default_file_mode()) << 16
+    zinfo.file_size = info.file_size
+    apply_car_compression(zinfo, zout)
+    with zin.open(info) as src, zout.open(zinfo, 'w') as dst:
+        shutil.copyfileobj(src, dst, CAR_COPY_BUFFER_SIZE)
+
+
+def repackage_cleaned_car(original_car_path: str, temp_dir: str, xml_path: str, modified_xml_path: str,
+                          car_path: str) -> str:
+    """
+    Build the final cleaned CAR straight from the original archive.
+    
+    Every entry is copied from the original CAR, and the modified XML is the
+    only file read from disk. XML files without "_modified" in their name are
+    left out, the remaining XML files lose the suffix, so the modified XML
+    takes the place of the original one.
     
     Args:
-        car_path: Path to the CAR file to process
+        original_car_path: Path to the original .car file
+        temp_dir: Path to the temporary directory the XML was extracted to
+        xml_path: Path to the extracted original XML file
+        modified_xml_path: Path to the modified XML file
+        car_path: Path of the CAR file to create
         
     Returns:
         str: Path to the new cleaned CAR file, or empty string if failed
     """
-    # Create a temporary directory for cleanup extraction
-    cleanup_temp_dir = tempfile.mkdtemp(prefix="car_cleanup_")
-    logger.info(f"Created cleanup temporary directory: {cleanup_temp_dir}")
-    
     try:
-        # Extract the CAR file
-        with zipfile.ZipFile(car_path, 'r') as zip_ref:
-            zip_ref.extractall(cleanup_temp_dir)
-            logger.info(f"Extracted {car_path} to {cleanup_temp_dir} for cleanup")
-        
-        # Find all XML files in the extracted directory
-        xml_files_found = []
-        xml_files_deleted = []
-        
-        for root, _, files in os.walk(cleanup_temp_dir):
-            for file in files:
-                if file.lower().endswith('.xml'):
-                    file_path = os.path.join(root, file)
-                    xml_files_found.append(file_path)
-                    
-                    # Check if the filename contains "_modified"
-                    if "_modified" not in file:
-                        try:
-                            os.remove(file_path)
-                            xml_files_deleted.append(file)
-                            logger.info(f"Deleted non-modified XML file in the final .car: {file}")
-                        except OSError as e:
-                            logger.error(f"Error deleting {file}: {e}")
-    
-        # Report what was found and deleted
-        logger.info(f"\nCleanup Summary:")
-        logger.info(f"  Total XML files found: {len(xml_files_found)}")
-        logger.info(f"  Non-modified XML files deleted: {len(xml_files_deleted)}")
-        logger.info(f"  Remaining XML files: {len(xml_files_found) - len(xml_files_deleted)}")
-        
-        if xml_files_deleted:
-            print(f"  Deleted files: {', '.join(xml_files_deleted)}")
-        
-        # Rename remaining XML files by removing "_modified" from their names
-        rename_modified_xml_files(cleanup_temp_dir)
-        
         # Create the final cleaned CAR file
-        base_name = os.path.splitext(car_path)[0]
-        cleaned_car_path = f"{base_name}.car"
+        cleaned_car_path = f"{os.path.splitext(car_path)[0]}.car"
+        
+        # Archive names always use '/'; the modified XML sits next to the original
+        xml_arcname = os.path.relpath(xml_path, temp_dir).replace(os.sep, '/')
+        modified_arcname = posixpath.join(posixpath.dirname(xml_arcname), os.path.basename(modified_xml_path))
         
-        # Create the new CAR file with remaining contents
-        with zipfile.ZipFile(cleaned_car_path, 'w', zipfile.ZIP_DEFLATED) as zipf:
-            # Add all remaining files from the temp directory to the zip
-            for root, _, files in os.walk(cleanup_temp_dir):
-                for file in files:
-                    file_path = os.path.join(root, file)
-                    # Calculate relative path in the zip file
-                    arcname = os.path.relpath(file_path, cleanup_temp_dir)
-                    zipf.write(file_path, arcname)
+        with zipfile.ZipFile(original_car_path, 'r') as zin, \
+                zipfile.ZipFile(cleaned_car_path, 'w', CAR_COMPRESSION, compresslevel=CAR_COMPRESS_LEVEL) as zout:
+            # An archived file named like the modified XML was overwritten by it
+            copy_cleaned_car_entries(zin, zout, skip_names=(modified_arcname,),
+                                     extra_files=((modified_xml_path, modified_arcname),))
         
         logger.info(f"Created cleaned CAR archive: {cleaned_car_path}")
         return cleaned_car_path
@@ -677,14 +992,61 @@ def cleanup_and_repackage_car(car_path: str) -> str:
     except Exception as e:
         logger.error(f"Error during cleanup and repackaging: {e}")
         return ""
+
+
+def claim_unique_destination(target_dir: str, filename: str) -> str:
+    """
+    Reserve a free file name in the target directory.
+    
+    Tries filename, then name(1).ext, name(2).ext, ... and creates the first
+    free one exclusively, so no other process can take the name between the
+    check and the move. Names already present are ruled out from a single
+    directory listing rather than one failed create per candidate.
+    
+    Args:
+        target_dir: Directory the file will be placed in
+        filename: Preferred file name
         
-    finally:
-        # Clean up the temporary directory
-        try:
-            shutil.rmtree(cleanup_temp_dir)
-            logger.info(f"Removed cleanup temporary directory: {cleanup_temp_dir}")
-        except Exception as e:
-            logger.error(f"Error cleaning up temporary directory: {e}")
+    Returns:
+        str: Path of the reserved (empty) destination file
+    """
+    name, ext = os.path.splitext(filename)
+    # normcase keeps the comparison case-insensitive where the filesystem is
+    existing = {os.path.normcase(entry.name) for entry in os.scandir(target_dir)}
+    counter = 1
+    candidate = filename
+    while True:
+        destination = os.path.join(target_dir, candidate)
+        if os.path.normcase(candidate) not in existing:
+            try:
+                os.close(os.open(destination, os.O_CREAT | os.O_EXCL | os.O_WRONLY))
+                return destination
+            except FileExistsError:
+                # Created by someone else since the listing was taken
+                pass
+        logger.warning(f"File already exists: {destination}. Attempting new filename.")
+        candidate = f"{name}({counter}){ext}"
+        counter += 1
+
+
+def move_file(src: str, destination: str) -> None:
+    """
+    Move a file, replacing the destination.
+    
+    Uses a plain rename when both paths are on the same filesystem and only
+    copies the data when the rename crosses devices.
+    
+    Args:
+        src: File to move
+        destination: Target path; an existing file there is replaced
+    """
+    try:
+        os.replace(src, destination)
+    except OSError as e:
+        if e.errno != errno.EXDEV:
+            raise
+        shutil.copy2(src, destination)
+        os.remove(src)
             
             
 ########################
@@ -730,6 +1092,25 @@ def validate_file_path(file_path: str) -> bool:
     return True
 
 
+def prompt_until_valid(message: str, validate: Callable[[str], Optional[str]], error_msg: str) -> str:
+    """
+    Prompt the user repeatedly until the validator accepts the stripped input.
+    
+    Args:
+        message: Prompt shown to the user
+        validate: Returns the accepted (possibly normalised) value, or None to re-prompt
+        error_msg: Message printed after each rejected input
+        
+    Returns:
+        str: The value returned by the validator
+    """
+    while True:
+        value = validate(input(message).strip())
+        if value is not None:
+            return value
+        print(error_msg)
+
+
 def prompt_for_prefix_path() -> str:
     """
     Prompt the user for a path prefix.
@@ -738,18 +1119,17 @@ def prompt_for_prefix_path() -> str:
     Returns:
         str: A valid path prefix starting with '/' and not ending with '/'
     """
-    while True:
-        prefix = input("\nEnter the full path prefix to prepend: ").strip()
+    prefix = input("\nEnter the full path prefix to prepend: ").strip()
+    
+    # Add leading slash if missing
+    if not prefix.startswith('/'):
+        prefix = '/' + prefix
         
-        # Add leading slash if missing
-        if not prefix.startswith('/'):
-            prefix = '/' + prefix
-            
-        # Remove trailing slash if present
-        if prefix.endswith('/'):
-            prefix = prefix[:-1]
-            
-        return prefix
+    # Remove trailing slash if present
+    if prefix.endswith('/'):
+        prefix = prefix[:-1]
+        
+    return prefix
 
 
 #######################
@@ -763,9 +1143,9 @@ def prompt_for_sftp_host() -> str:
     Returns:
         str: A valid SFTP host IP address or 'localhost'
     """
-    while True:
-        host = input("\nEnter the new SFTP host IP address (or 'localhost'): ").strip()
-        
+    ip_address = ipaddress.ip_address
+    
+    def validate(host: str) -> Optional[str]:
         # Check if the host is 'localhost'
         if host.lower() == 'localhost':
             logger.info("[SFTP] Using localhost as SFTP host")
@@ -773,12 +1153,15 @@ def prompt_for_sftp_host() -> str:
         
         # Validate as IP address
         try:
-            ipaddress.ip_address(host)
-            logger.info(f"[SFTP] Valid IP address entered: {host}")
-            return host
+            ip_address(host)
         except ValueError:
             logger.warning(f"[INVALID] Invalid IP address entered: {host}")
-            print("Error: Please enter a valid IP address (xxx.xxx.xxx.xxx) or 'localhost'")
+            return None
+        logger.info(f"[SFTP] Valid IP address entered: {host}")
+        return host
+    
+    return prompt_until_valid("\nEnter the new SFTP host IP address (or 'localhost'): ", validate,
+                              "Error: Please enter a valid IP address (xxx.xxx.xxx.xxx) or 'localhost'")
 
 
 def prompt_for_encrypted_password() -> str:
@@ -788,16 +1171,16 @@ def prompt_for_encrypted_password() -> str:
     Returns:
         str: A non-empty encrypted password
     """
-    while True:
-        password = input("\nEnter the SFTP password: ").strip()
-        
-        if password:
-            logger.info("[SFTP] Encrypted password received (not logged for security)")
-            return password
-        else:
+    def validate(password: str) -> Optional[str]:
+        if not password:
             logger.warning("[SFTP] Empty password entered")
-            print("Error: Password cannot be empty")
-            
+            return None
+        logger.info("[SFTP] Encrypted password received (not logged for security)")
+        return password
+    
+    return prompt_until_valid("\nEnter the SFTP password: ", validate, "Error: Password cannot be empty")
+
+
 def prompt_for_sftp_username() -> str:
     """
     Prompt the user for an SFTP username.
@@ -805,332 +1188,83 @@ def prompt_for_sftp_username() -> str:
     Returns:
         str: A non-empty SFTP username
     """
-    while True:
-        username = input("\nEnter the SFTP username: ").strip()
-        
-        if username:
-            logger.info(f"[SFTP] Username provided: '{username}'")
-            return username
-        else:
+    def validate(username: str) -> Optional[str]:
+        if not username:
             logger.warning("[SFTP] Empty username entered")
-            print("Error: Username cannot be empty")
-
-
-def update_sftp_username(file_path: str, output_file: str, new_username: str) -> bool:
-    """
-    Update SFTP username in the XML file for both ppsSFTPUserF and neSFTPClientUserF tags.
+            return None
+        logger.info(f"[SFTP] Username provided: '{username}'")
+        return username
     
-    Args:
-        file_path: Path to the original XML file
-        output_file: Path for the modified XML file
-        new_username: New SFTP username
-        
-    Returns:
-        bool: True if successful, False otherwise
-    """
-    try:
-        logger.info(f"Starting update of SFTP username in file: {file_path}")
-        logger.debug(f"Target output file: {output_file}")
-        logger.debug(f"New SFTP username: {new_username}")
-        username_tags_found = False
-        
-        with open(file_path, 'r') as in_file, open(output_file, 'w') as out_file:
-            for line in in_file:
-                modified_line = line
-                
-                # Look for the ppsSFTPUserF tag
-                user_pattern = r"<ppsSFTPUserF>(?:<!\[CDATA\[(.*?)\]\]>|([^<]+))?</ppsSFTPUserF>"
-                matches = re.finditer(user_pattern, line)
-                
-                for match in matches:
-                    username_tags_found = True
-                    # Get the full tag content
-                    full_tag = match.group(0)
-                    
-                    # Check if the original had CDATA
-                    if "<![CDATA[" in full_tag:
-                        new_tag = f"<ppsSFTPUserF><![CDATA[{new_username}]]></ppsSFTPUserF>"
-                    else:
-                        new_tag = f"<ppsSFTPUserF>{new_username}</ppsSFTPUserF>"
-                    
-                    # Replace the old tag content with the new one
-                    modified_line = modified_line.replace(full_tag, new_tag)
-                
-                # Look for the neSFTPClientUserF tag
-                client_user_pattern = r"<neSFTPClientUserF>(?:<!\[CDATA\[(.*?)\]\]>|([^<]+))?</neSFTPClientUserF>"
-                client_matches = re.finditer(client_user_pattern, modified_line)
-                
-                for match in client_matches:
-                    username_tags_found = True
-                    # Get the full tag content
-                    full_tag = match.group(0)
-                    
-                    # Check if the original had CDATA
-                    if "<![CDATA[" in full_tag:
-                        new_tag = f"<neSFTPClientUserF><![CDATA[{new_username}]]></neSFTPClientUserF>"
-                    else:
-                        new_tag = f"<neSFTPClientUserF>{new_username}</neSFTPClientUserF>"
-                    
-                    # Replace the old tag content with the new one
-                    modified_line = modified_line.replace(full_tag, new_tag)
-                
-                out_file.write(modified_line)
-        
-        if not username_tags_found:
-            logger.warning("No <ppsSFTPUserF> or <neSFTPClientUserF> tags found in the XML file.")
-            print("Warning: No <ppsSFTPUserF> or <neSFTPClientUserF> tags found in the XML file.")
-            return False
-        logger.info(f"Successfully updated SFTP usernames and wrote to: {output_file}")    
-        return True
-    except IOError as e:
-        logger.error(f"File I/O error during SFTP username update: {e}")
-        print(f"Error processing file: {e}")
-        return False
+    return prompt_until_valid("\nEnter the SFTP username: ", validate, "Error: Username cannot be empty")
 
 
-def update_sftp_host(file_path: str, output_file: str, new_host: str) -> bool:
-    """
-    Update the SFTP host IP address in the XML file for both ppsSFTPHostF and neSFTPClientHostF tags.
-    
-    Args:
-        file_path: Path to the original XML file
-        output_file: Path for the modified XML file
-        new_host: New SFTP host IP address
-        
-    Returns:
-        bool: True if successful, False otherwise
-    """
-    try:
-        host_tags_found = False
-        
-        with open(file_path, 'r') as in_file, open(output_file, 'w') as out_file:
-            for line in in_file:
-                modified_line = line
-                
-                # Look for the ppsSFTPHostF tag
-                host_pattern = r"<ppsSFTPHostF>(?:<!\[CDATA\[(.*?)\]\]>|([^<]+))</ppsSFTPHostF>"
-                match = re.search(host_pattern, line)
-                
-                if match:
-                    host_tags_found = True
-                    # Get the full tag content
-                    full_tag = match.group(0)
-                    
-                    # Check if the original had CDATA
-                    if "<![CDATA[" in full_tag:
-                        new_tag = f"<ppsSFTPHostF><![CDATA[{new_host}]]></ppsSFTPHostF>"
-                    else:
-                        new_tag = f"<ppsSFTPHostF>{new_host}</ppsSFTPHostF>"
-                    
-                    # Replace the old tag content with the new one
-                    modified_line = modified_line.replace(full_tag, new_tag)
-                
-                # Look for the neSFTPClientHostF tag
-                client_host_pattern = r"<neSFTPClientHostF>(?:<!\[CDATA\[(.*?)\]\]>|([^<]+))</neSFTPClientHostF>"
-                client_match = re.search(client_host_pattern, modified_line)
-                
-                if client_match:
-                    host_tags_found = True
-                    # Get the full tag content
-                    full_tag = client_match.group(0)
-                    
-                    # Check if the original had CDATA
-                    if "<![CDATA[" in full_tag:
-                        new_tag = f"<neSFTPClientHostF><![CDATA[{new_host}]]></neSFTPClientHostF>"
-                    else:
-                        new_tag = f"<neSFTPClientHostF>{new_host}</neSFTPClientHostF>"
-                    
-                    # Replace the old tag content with the new one
-                    modified_line = modified_line.replace(full_tag, new_tag)
-                
-                out_file.write(modified_line)
-        
-        if not host_tags_found:
-            print("Warning: No <ppsSFTPHostF> or <neSFTPClientHostF> tags found in the XML file.")
-            return False
-            
-        return True
-    except IOError as e:
-        print(f"Error processing file: {e}")
-        return False
+#######################
+# File Processor Module #
+#######################
 
+# Buffer used for whole-file XML reads and writes (1 MiB)
+XML_IO_BUFFER_SIZE = 1 << 20
 
-def update_sftp_password(file_path: str, output_file: str, new_password: str) -> bool:
-    """
-    Update the encrypted SFTP password in the XML file for multiple password tags.
-    
-    Args:
-        file_path: Path to the original XML file
-        output_file: Path for the modified XML file
-        new_password: New encrypted SFTP password
-        
-    Returns:
-        bool: True if successful, False otherwise
-    """
-    try:
-        # List of password-related tags to update
-        password_tags = ['ppsSFTPPasswordF', 'neSFTPClientPasswordF']  # Add more tags here in the future
-        password_tags_found = False
-        
-        with open(file_path, 'r') as in_file, open(output_file, 'w') as out_file:
-            for line in in_file:
-                modified_line = line
-                
-                # Process each password tag
-                for tag in password_tags:
-                    # Look for the tag
-                    password_pattern = fr"<{tag}>(?:<!\[CDATA\[(.*?)\]\]>|([^<]+))?</{tag}>"
-                    matches = re.finditer(password_pattern, modified_line)
-                    
-                    for match in matches:
-                        password_tags_found = True
-                        # Get the full tag content
-                        full_tag = match.group(0)
-                        
-                        # Check if the original had CDATA
-                        if "<![CDATA[" in full_tag:
-                            new_tag = f"<{tag}><![CDATA[{new_password}]]></{tag}>"
-                        else:
-                            new_tag = f"<{tag}>{new_password}</{tag}>"
-                        
-                        # Replace the old tag content with the new one
-                        modified_line = modified_line.replace(full_tag, new_tag)
-                
-                out_file.write(modified_line)
-        
-        if not password_tags_found:
-            found_tags = ', '.join([f'<{tag}>' for tag in password_tags])
-            print(f"Warning: None of the password tags ({found_tags}) found in the XML file.")
-            return False
-            
-        return True
-    except IOError as e:
-        print(f"Error processing file: {e}")
-        return False
+# XML files are decoded as UTF-8 whatever the locale; bytes that are not valid
+# UTF-8 are carried through as surrogates and written back unchanged
+XML_ENCODING = 'utf-8'
+XML_ENCODING_ERRORS = 'surrogateescape'
 
 
-def update_sftp_pass_flags(file_path: str, output_file: str) -> bool:
+def read_xml_content(file_path: str) -> str:
     """
-    Update all SFTP pass flag tags to contain 0.
+    Read a whole XML file into memory so all operations can work on one buffer.
     
     Args:
-        file_path: Path to the original XML file
-        output_file: Path for the modified XML file
-        
+        file_path: Path to the XML file
+    
     Returns:
-        bool: True if successful, False otherwise
+        str: The content of the file
+    
+    Raises:
+        IOError: If there is an issue reading the file
     """
-    try:
-        # List of pass flag related tags to update
-        flag_tags = ['ppsSFTPPassFlagF', 'neSFTPClientPassFlagF']  # Add more tags here in the future
-        flag_tags_found = False
-        logger.info(f"Updating SFTP pass flag tags in file: {file_path}")
-        
-        with open(file_path, 'r') as in_file, open(output_file, 'w') as out_file:
-            for line in in_file:
-                modified_line = line
-                
-                # Process each pass flag tag
-                for tag in flag_tags:
-                    # Look for the tag
-                    flag_pattern = fr"<{tag}>(?:<!\[CDATA\[(.*?)\]\]>|([^<]+))?</{tag}>"
-                    matches = re.finditer(flag_pattern, modified_line)
-                    
-                    for match in matches:
-                        flag_tags_found = True
-                        # Get the full tag content
-                        full_tag = match.group(0)
-                        
-                        # Check if the original had CDATA
-                        if "<![CDATA[" in full_tag:
-                            new_tag = f"<{tag}><![CDATA[0]]></{tag}>"
-                        else:
-                            new_tag = f"<{tag}>0</{tag}>"
-                        
-                        # Replace the old tag content with the new one
-                        modified_line = modified_line.replace(full_tag, new_tag)
-                
-                out_file.write(modified_line)
-        
-        if not flag_tags_found:
-            found_tags = ', '.join([f'<{tag}>' for tag in flag_tags])
-            print(f"Warning: None of the pass flag tags ({found_tags}) found in the XML file.")
-            logger.warning(f"None of the pass flag tags ({found_tags}) found in the XML file: {file_path}")
-            return False
-        logger.info(f"SFTP pass flag tags updated successfully in: {output_file}")    
-        return True
-    except IOError as e:
-        logger.error(f"Error processing file '{file_path}': {e}")
-        print(f"Error processing file: {e}")
-        return False
-
+    logger.info(f"Attempting to read file: {file_path}")
+    with open(file_path, 'r', buffering=XML_IO_BUFFER_SIZE, encoding=XML_ENCODING, errors=XML_ENCODING_ERRORS) as file:
+        return file.read()
 
-#######################
-# File Processor Module #
-#######################
 
-def read_xml_lines(file_path: str) -> Iterator[str]:
+def write_xml_content(file_path: str, xml_content: str) -> None:
     """
-    Read an XML file line by line to avoid loading large files into memory.
+    Write XML content to a file in a single call.
     
     Args:
-        file_path: Path to the XML file
-        
-    Yields:
-        Each line from the file
+        file_path: Path of the file to write
+        xml_content: Content to write
     
     Raises:
-        IOError: If there is an issue reading the file
-        SystemExit: If the file cannot be read
+        IOError: If there is an issue writing the file
     """
-    logger.info(f"Attempting to read file: {file_path}")
-    try:
-        with open(file_path, 'r') as file:
-            for line in file:
-                yield line
-    except IOError as e:
-        print(f"Error reading file: {e}")
-        logger.error(f"Failed to read file '{file_path}': {e}")
-        error_msg = f"Failed to read file '{file_path}': {e}"
-        handle_error_with_countdown(error_msg)
+    with open(file_path, 'w', buffering=XML_IO_BUFFER_SIZE, encoding=XML_ENCODING, errors=XML_ENCODING_ERRORS) as file:
+        file.write(xml_content)
 
 
 #######################
 # Path Processor Module #
 #######################
 
-def extract_paths_from_line(line: str) -> List[Tuple[str, str, str]]:
+def extract_name_from_content(xml_content: str) -> str:
     """
-    Extract paths from specific tags in a line of XML.
+    Extract the content from the first non-empty <name> tag in XML content.
     
     Args:
-        line: A line of XML text
+        xml_content: Content of the XML file
         
     Returns:
-        List of tuples containing (tag_name, original_path, full_tag_content)
-    """
-    # List of tags we're looking for
-    tags = ['ppsDiskPathF', 'neDiskPathF', 'ppsSFTPPathF' , 'neSFTPClientPathF' , 'matcherPathF' , 'scPathF']
-    results = []
-    
-    # Process each tag type
-    for tag in tags:
-        # Pattern to match both regular content and CDATA sections:
-        # <tagname>path</tagname> or <tagname><![CDATA[path]]></tagname>
-        pattern = fr"<{tag}>(?:<!\[CDATA\[(.*?)\]\]>|([^<]+))</{tag}>"
-        matches = re.finditer(pattern, line)
-
-        for match in matches:
-            # The path is either in group 1 (CDATA) or group 2 (plain text)
-            path = match.group(1) if match.group(1) is not None else match.group(2)
-            # Get the full tag content (including tags)
-            full_tag = match.group(0)
-            if path:  # Only add if we found a path
-                results.append((tag, path, full_tag))
-            else:
-                logger.warning(f"Tag <{tag}> found but it is empty or malformed: {full_tag}")
-    
-    return results
+        str: The content of the first <name> tag, or empty string if not found
+    """
+    for match in _NAME_TAG_RE.finditer(xml_content):
+        # The name is either in group 1 (CDATA) or group 2 (plain text)
+        name = match.group(1) if match.group(1) is not None else match.group(2)
+        if name:
+            return name.strip()
+    return ""
+
 
 def extract_name_from_xml(file_path: str) -> str:
     """
@@ -1143,45 +1277,36 @@ def extract_name_from_xml(file_path: str) -> str:
         str: The content of the first <name> tag, or empty string if not found
     """
     try:
-        with open(file_path, 'r') as file:
+        with open(file_path, 'r', encoding=XML_ENCODING, errors=XML_ENCODING_ERRORS) as file:
             for line in file:
-                # Look for the name tag
-                name_pattern = r"<name>(?:<!\[CDATA\[(.*?)\]\]>|([^<]+))</name>"
-                match = re.search(name_pattern, line)
-                if match:
-                    # The name is either in group 1 (CDATA) or group 2 (plain text)
-                    name = match.group(1) if match.group(1) is not None else match.group(2)
+                # Only lines holding a name tag are searched; stop at the first name
+                if "<name>" in line:
+                    name = extract_name_from_content(line)
                     if name:
-                        return name.strip()
-    except Exception as e:
-        logging.error(f"Error extracting name from XML: {e}")
+                        return name
+    except (OSError, UnicodeDecodeError) as e:
+        logger.error(f"Error extracting name from XML: {e}")
     
     return ""
 
 
-def create_mkdir_commands(paths: List[Tuple[str, str]], prefix: str) -> List[str]:
+def create_mkdir_commands(paths: Iterable[Tuple[str, str]], prefix: str) -> Set[str]:
     """
-    Create mkdir commands for each extracted path with the prefix.
+    Create the unique mkdir commands for the extracted paths with the prefix.
     
     Args:
-        paths: List of (tag_name, path) tuples
+        paths: Iterable of (tag_name, path) tuples; consumed once
         prefix: Path prefix to prepend
         
     Returns:
-        List of mkdir commands
+        Set of mkdir commands; duplicate paths collapse into one command
     """
-    commands = []
     logger.info("Generating mkdir commands...")
-    for _, path in paths:
-        # Combine the prefix with the path, ensuring there's no double slash
-        # Using os.path.join will handle path concatenation properly
-        combined_path = f"{prefix.rstrip('/')}/{path.lstrip('/')}"
-        # print(f'mkdir -p "{combined_path}"')
-        
-        # Create the mkdir command with the -p option to create parent directories as needed
-        # We quote the path to handle spaces and special characters
-        commands.append(f'mkdir -p "{combined_path}"')
-        # print("Combined Path is", combined_path)
+    # Combine the prefix with each path, ensuring there's no double slash
+    base = prefix.rstrip('/')
+    # Create the mkdir command with the -p option to create parent directories as needed
+    # We quote the path to handle spaces and special characters
+    commands = {f'mkdir -p "{base}/{path.lstrip("/")}"' for _, path in paths}
     
     if not commands:
         logger.warning("No mkdir commands were generated. Input path list may be empty or invalid.")
@@ -1194,13 +1319,16 @@ def create_mkdir_commands(paths: List[Tuple[str, str]], prefix: str) -> List[str
 # Output Generator Module #
 #######################
 
-def write_mkdir_script(commands: List[str], file_path: str) -> None:
+def write_mkdir_script(commands: Set[str], file_path: str, total_commands: Optional[int] = None,
+                       name: Optional[str] = None) -> None:
     """
-    Write mkdir commands to an output file, removing duplicates.
+    Write the unique mkdir commands to an output file in sorted order.
     
     Args:
-        commands: List of mkdir commands
-        output_file: Name of the output file
+        commands: Set of mkdir commands
+        file_path: Path of the XML file the commands were generated from
+        total_commands: Number of commands before deduplication, used to report duplicates
+        name: Stream name taken from the XML content; read from file_path when not given
     """
     try:
         logger.info("Preparing to write mkdir commands to file...")
@@ -1208,16 +1336,15 @@ def write_mkdir_script(commands: List[str], file_path: str) -> None:
         target_folder = os.path.join(os.getcwd(), "Manual commands for creating path")
         os.makedirs(target_folder, exist_ok=True)  # 🔹 Create the folder if it doesn't exist
         
-        name = extract_name_from_xml(file_path)
+        if name is None:
+            name = extract_name_from_xml(file_path)
         if not name:
             name = os.path.splitext(os.path.basename(file_path))[0]
             logger.warning("Fallback: using base filename as name due to empty extract_name_from_xml result.")
             
         # Clean the name to be filesystem-safe
-        name = re.sub(r'[\\/*?:"<>|]', "_", name).strip()
+        name = name.translate(_UNSAFE_FS_CHARS).strip()
         
-        
-        input_filename = os.path.basename(file_path)
         output_file = f"Commands for {name}.txt"
 
         
@@ -1226,24 +1353,29 @@ def write_mkdir_script(commands: List[str], file_path: str) -> None:
         output_path = os.path.join(target_folder, output_file)
         
         
-        # Use a set to remove duplicate commands
-        unique_commands = list(set(commands))
         # Sort the commands to ensure consistent output
-        unique_commands.sort()
+        unique_commands = sorted(commands)
         
-        with open(output_path, 'w') as file:
-            for command in unique_commands:
-                file.write(f"{command}\n")
+        # One string and a single write for the whole script
+        with open(output_path, 'w', buffering=XML_IO_BUFFER_SIZE) as file:
+            if unique_commands:
+                file.write("\n".join(unique_commands) + "\n")
         
         logger.info(f"Successfully wrote {len(unique_commands)} mkdir commands to '{output_path}'")
         # Calculate how many duplicates were removed
-        duplicates_removed = len(commands) - len(unique_commands)
+        if total_commands is None:
+            total_commands = len(unique_commands)
+        duplicates_removed = total_commands - len(unique_commands)
         print(f"Successfully wrote {len(unique_commands)} mkdir commands to '{output_file}' (removed {duplicates_removed} duplicates)")
     except IOError as e:
         logger.error(f"IO error while writing to the file': {e}")
         print(f"Error writing to file: {e}")
 
 
+# Output suffix per supported input extension; anything else gets a bare '_modified'
+OUTPUT_SUFFIXES = {'.xml': '_modified.xml', '.car': '_modified.car'}
+
+
 def get_output_filename(input_file: str) -> str:
     """
     Generate a name for the modified output file based on input file type,
@@ -1257,16 +1389,10 @@ def get_output_filename(input_file: str) -> str:
     """
     # Get the directory, file name without extension, and extension
     dir_name = os.path.dirname(input_file)
-    base_name = os.path.splitext(os.path.basename(input_file))[0]
-    ext = os.path.splitext(input_file)[1].lower()
+    base_name, ext = os.path.splitext(os.path.basename(input_file))
     
     # Create a new filename with appropriate suffix in the same directory
-    if ext == '.xml':
-        return os.path.join(dir_name, f"{base_name}_modified.xml")
-    elif ext == '.car':
-        return os.path.join(dir_name, f"{base_name}_modified.car")
-    else:
-        return os.path.join(dir_name, f"{base_name}_modified")
+    return os.path.join(dir_name, base_name + OUTPUT_SUFFIXES.get(ext.lower(), '_modified'))
 
 
 
@@ -1291,66 +1417,23 @@ def prompt_for_output_filename(default_name: str) -> str:
     # For XML files - force into "Modified files" folder
     if default_name.lower().endswith('.xml'):
         filename = os.path.basename(default_name)
-        default_name = os.path.join(modified_files_dir, filename)
         
-     # Handle duplicates for XML files
-    if default_name.lower().endswith('.xml'):
-        base, ext = os.path.splitext(default_name)
+        # Handle duplicates with one directory listing instead of a stat per candidate;
+        # normcase keeps the comparison case-insensitive where the filesystem is
+        existing = {os.path.normcase(entry.name) for entry in os.scandir(modified_files_dir)}
+        base, ext = os.path.splitext(filename)
         counter = 1
-        new_name = default_name
-        while os.path.exists(new_name):
+        new_name = filename
+        while os.path.normcase(new_name) in existing:
             new_name = f"{base}_{counter}{ext}"
             counter += 1
-        default_name = new_name
+        default_name = os.path.join(modified_files_dir, new_name)
     
     # Show suggestion to user
     print(f"\nSuggested output file: {default_name}")
     return default_name
 
 
-def regenerate_xml(input_file: str, output_file: str, prefix: str) -> None:
-    """
-    Create a new XML file with updated paths.
-    
-    Args:
-        input_file: Path to the original XML file
-        output_file: Path for the regenerated XML file
-        prefix: Path prefix to prepend
-    """
-    try:
-        with open(output_file, 'w') as out_file:
-            # Process the XML file line by line
-            for line in read_xml_lines(input_file):
-                modified_line = line
-                
-                # Extract paths from this line
-                extractions = extract_paths_from_line(line)
-                
-                # If any paths were found, update them in the line
-                for tag, path, full_tag in extractions:
-                    # Create the new combined path
-                    combined_path = os.path.join(prefix, path.lstrip('/'))
-                    combined_path = combined_path.replace("\\", "/") 
-                    
-                    # Check if the original had CDATA
-                    if "<![CDATA[" in full_tag:
-                        # Create new tag content with the updated path wrapped in CDATA
-                        new_tag = f"<{tag}><![CDATA[{combined_path}]]></{tag}>"
-                    else:
-                        # Create new tag content with the updated path
-                        new_tag = f"<{tag}>{combined_path}</{tag}>"
-                    
-                    # Replace the old tag content with the new one
-                    # This preserves all other aspects of the XML structure
-                    modified_line = modified_line.replace(full_tag, new_tag)
-                
-                # Write the modified (or original) line to the output file
-                out_file.write(modified_line)
-                
-        print(f"Successfully generated modified XML file: '{output_file}'")
-    except IOError as e:
-        print(f"Error writing to file: {e}")
-        
 def prompt_for_default_stopped() -> bool:
     """
     Prompt the user to decide whether to set 'Default Stopped' to 'True' for all collectors.
@@ -1362,57 +1445,6 @@ def prompt_for_default_stopped() -> bool:
     return user_input == 'Y'
 
 
-def update_default_stopped_state(file_path: str, output_file: str) -> bool:
-    """
-    Update all <defaultStoppedState> tags in the XML file to contain value '1' (True).
-    
-    This function scans through an XML file, identifies all <defaultStoppedState> tags,
-    and changes their values to '1', indicating that collectors should be stopped by default.
-    
-    Args:
-        file_path: Path to the original XML file
-        output_file: Path for the modified XML file
-        
-    Returns:
-        bool: True if successful, False otherwise
-    """
-    try:
-        default_stopped_tags_found = False
-        
-        with open(file_path, 'r') as in_file, open(output_file, 'w') as out_file:
-            for line in in_file:
-                modified_line = line
-                
-                # Look for the defaultStoppedState tag
-                # Pattern to match both regular content and CDATA sections
-                stopped_pattern = r"<defaultStoppedState>(?:<!\[CDATA\[(.*?)\]\]>|([^<]+))?</defaultStoppedState>"
-                matches = re.finditer(stopped_pattern, line)
-                
-                for match in matches:
-                    default_stopped_tags_found = True
-                    # Get the full tag content
-                    full_tag = match.group(0)
-                    
-                    # Check if the original had CDATA
-                    if "<![CDATA[" in full_tag:
-                        new_tag = f"<defaultStoppedState><![CDATA[1]]></defaultStoppedState>"
-                    else:
-                        new_tag = f"<defaultStoppedState>1</defaultStoppedState>"
-                    
-                    # Replace the old tag content with the new one
-                    modified_line = modified_line.replace(full_tag, new_tag)
-                
-                out_file.write(modified_line)
-        
-        if not default_stopped_tags_found:
-            print("Warning: No <defaultStoppedState> tags found in the XML file.")
-            return False
-            
-        print("Successfully updated all collectors to 'Default Stopped' state.")
-        return True
-    except IOError as e:
-        print(f"Error processing file: {e}")
-        return False
 def display_xml_compatibility_warning() -> None:
     """
     Display a formal warning message about XML file compatibility requirements.
@@ -1513,17 +1545,37 @@ def find_car_xml_files(dir_path: str) -> Dict[str, List[str]]:
     """
     car_files = []
     xml_files = []
+    # Both supported extensions are four characters long, so one slice of the
+    # name picks the target list; the bound append methods are looked up once
+    find_bucket = {'.car': car_files.append, '.xml': xml_files.append}.get
     
     logging.info(f"Searching for .car and .xml files in {dir_path} and subdirectories")
     
     try:
-        for root, _, files in os.walk(dir_path):
-            for file in files:
-                file_path = os.path.join(root, file)
-                if file.lower().endswith('.car'):
-                    car_files.append(file_path)
-                elif file.lower().endswith('.xml'):
-                    xml_files.append(file_path)
+        # Walk with os.scandir and an explicit stack; the directory listing already
+        # tells files from directories, so no per-entry stat is needed. Subdirectories
+        # are pushed in reverse to keep os.walk's top-down order.
+        pending = [dir_path]
+        while pending:
+            current_dir = pending.pop()
+            subdirs = []
+            add_subdir = subdirs.append
+            try:
+                with os.scandir(current_dir) as entries:
+                    for entry in entries:
+                        if entry.is_dir(follow_symlinks=False):
+                            add_subdir(entry.path)
+                            continue
+                        add_file = find_bucket(entry.name[-4:].lower())
+                        # Like os.walk, symlinked directories are neither descended into
+                        # nor listed; only symlinks with a matching name need the stat
+                        # that tells them apart from symlinked files
+                        if add_file is not None and not (entry.is_symlink() and entry.is_dir()):
+                            add_file(entry.path)
+            except OSError as e:
+                # os.walk skipped unreadable directories; keep doing so
+                logging.warning(f"Skipping unreadable directory '{current_dir}': {e}")
+            pending.extend(reversed(subdirs))
     
         logging.info(f"Found {len(car_files)} .car files and {len(xml_files)} .xml files")
         return {'car': car_files, 'xml': xml_files}
@@ -1550,25 +1602,24 @@ def display_files(files_dict: Dict[str, List[str]]) -> bool:
         print("No .car or .xml files found in the specified directory.")
         return False
     
-    print(f"\nFound {total_files} file(s):")
+    # Build the whole listing first and write it in one call rather than one
+    # print (and terminal flush) per file
+    lines = [f"\nFound {total_files} file(s):"]
     
     file_index = 1
     
     if car_files:
-        print("\nCAR Files:")
-        for i, file_path in enumerate(car_files, start=file_index):
-            # Extract just the filename without the path
-            file_name = os.path.basename(file_path)
-            print(f"{i}. {file_name}")
+        lines.append("\nCAR Files:")
+        # Show just the filename without the path
+        lines.extend(f"{i}. {os.path.basename(file_path)}" for i, file_path in enumerate(car_files, start=file_index))
         file_index += len(car_files)
     
     if xml_files:
-        print("\nXML Files:")
-        for i, file_path in enumerate(xml_files, start=file_index):
-            # Extract just the filename without the path
-            file_name = os.path.basename(file_path)
-            print(f"{i}. {file_name}")
+        lines.append("\nXML Files:")
+        lines.extend(f"{i}. {os.path.basename(file_path)}" for i, file_path in enumerate(xml_files, start=file_index))
     
+    lines.append("")
+    sys.stdout.write("\n".join(lines))
     return True
 
 def prompt_for_file_selection(files_dict: Dict[str, List[str]]) -> Optional[str]:
@@ -1658,6 +1709,95 @@ def get_yes_no_input(prompt: str) -> bool:
             print("Please enter only 'y' or 'n'.")
 
 
+# Environment variable preselecting the operations, e.g. BLDM_OPERATIONS=huf,
+# so scripted runs answer one setting instead of six prompts
+OPERATIONS_ENV = 'BLDM_OPERATIONS'
+
+# (key, operation, prompt, log message) for every operation, in the order they run
+OPERATION_CHOICES = (
+    ('p', "paths", "Update Collector and Distributer Disk paths? (y/n): ", "User selected to process paths"),
+    ('h', "host", "Update SFTP host IP? (y/n): ", "User selected to update SFTP host IP"),
+    ('u', "username", "Update SFTP username? (y/n): ", "User selected to update SFTP username"),
+    ('w', "password", "Update encrypted SFTP password? (y/n): ", "User selected to update SFTP password"),
+    ('f', "flags", "Update SFTP 'Password Not Required Field' to no? (y/n): ", "User selected to update password flags"),
+    ('d', "default_stopped", "Set 'Default Stopped' to 'True' for all collectors? (y/n): ", "User selected to update default stopped state"),
+)
+
+
+def select_operations() -> List[str]:
+    """
+    Ask the user which operations to perform.
+    
+    When BLDM_OPERATIONS holds operation keys (p=paths, h=host, u=username,
+    w=password, f=flags, d=default stopped) they are used without prompting;
+    otherwise, or if the value contains unknown keys or no operation key at
+    all, each operation is asked with a y/n prompt.
+    
+    Returns:
+        List[str]: The selected operations, in the order they run
+    """
+    preset = os.environ.get(OPERATIONS_ENV, "").strip().lower()
+    if preset:
+        known_keys = {key for key, _, _, _ in OPERATION_CHOICES}
+        unknown = set(preset) - known_keys - {',', ' '}
+        if unknown:
+            logger.warning(f"Ignoring {OPERATIONS_ENV}: unknown operation keys {''.join(sorted(unknown))}")
+            print(f"Ignoring {OPERATIONS_ENV}: unknown operation keys '{''.join(sorted(unknown))}'.")
+        elif not set(preset) & known_keys:
+            # Only separators: nothing preselected, so fall back to the prompts
+            logger.warning(f"Ignoring {OPERATIONS_ENV}: no operation keys in '{preset}'")
+            print(f"Ignoring {OPERATIONS_ENV}: no operation keys in '{preset}'.")
+        else:
+            operations = [operation for key, operation, _, _ in OPERATION_CHOICES if key in preset]
+            logger.info(f"Operations preselected through {OPERATIONS_ENV}: {', '.join(operations)}")
+            return operations
+    
+    operations = []
+    print("\nSelect operations to perform (y/n for each):")
+    logger.info("Prompting user for operations to perform")
+    for _, operation, prompt, selected_msg in OPERATION_CHOICES:
+        if get_yes_no_input(prompt):
+            operations.append(operation)
+            logger.info(selected_msg)
+    return operations
+
+
+def build_main_banner() -> str:
+    """
+    Build the start-up banner shown by main.
+    
+    Returns:
+        str: The whole banner, ready to print in one call
+    """
+    RESET = "\033[0m"
+    CYAN = "\033[96m"
+    BOLD = "\033[1m"
+    
+    return "\n".join([
+        f"\n{CYAN}╔══════════════════════════════════════════════════════════════╗{RESET}",
+        f"{CYAN}║{BOLD}                  BLDM CONFIG LOCALIZER  •  v1.1.1            {RESET}{CYAN}║{RESET}",
+        f"{CYAN}╚══════════════════════════════════════════════════════════════╝{RESET}",
+        f"{CYAN}║                                                              ║{RESET}",
+        f"{CYAN}║  {BOLD}CORE FEATURES:{RESET}{CYAN}                                              ║{RESET}",
+        f"{CYAN}║    • Path localization for target environments               ║{RESET}",
+        f"{CYAN}║    • Automated SFTP configuration                            ║{RESET}",
+        f"{CYAN}║    • Collector state standardization                         ║{RESET}",
+        f"{CYAN}║    • CAR/XML processing                                      ║{RESET}",
+        f"{CYAN}║                                                              ║{RESET}",
+        f"{CYAN}║  {BOLD}WORKFLOW:{RESET}{CYAN}                                                   ║{RESET}",
+        f"{CYAN}║    1. Import source configuration                            ║{RESET}",
+        f"{CYAN}║    2. Set localization parameters                            ║{RESET}",
+        f"{CYAN}║                                                              ║{RESET}",
+        f"{CYAN}╔══════════════════════════════════════════════════════════════╗{RESET}",
+        f"{CYAN}║  {BOLD}SAFETY:{RESET} Original preservation  •  Audit logging             {CYAN}║{RESET}",
+        f"{CYAN}╚══════════════════════════════════════════════════════════════╝{RESET}",
+    ])
+
+
+# Built once at import; main prints it with a single write
+MAIN_BANNER = build_main_banner()
+
+
 def main() -> None:
     """
     Main function to orchestrate the XML/CAR processing workflow with directory search functionality.
@@ -1680,41 +1820,11 @@ def main() -> None:
         
         # Log this information
         logger.info(f"Session started - User: {user} | Host: {host}")
-        # Get log file path from the logger
-        log_file_path = None
-        for handler in logger.handlers:
-            if isinstance(handler, logging.FileHandler):
-                log_file_path = handler.baseFilename
-                break
             
         logger.info("=== Initializing XML/CAR Path Processor ===")
         operations_performed = []
 
-        RESET = "\033[0m"
-        CYAN = "\033[96m"
-        GREEN = "\033[92m"
-        YELLOW = "\033[93m"
-        RED = "\033[91m"
-        BOLD = "\033[1m"
-        DIM = "\033[2m"
-        
-        print(f"\n{CYAN}╔══════════════════════════════════════════════════════════════╗{RESET}")
-        print(f"{CYAN}║{BOLD}                  BLDM CONFIG LOCALIZER  •  v1.1.1            {RESET}{CYAN}║{RESET}")
-        print(f"{CYAN}╚══════════════════════════════════════════════════════════════╝{RESET}")
-        print(f"{CYAN}║                                                              ║{RESET}")
-        print(f"{CYAN}║  {BOLD}CORE FEATURES:{RESET}{CYAN}                                              ║{RESET}")
-        print(f"{CYAN}║    • Path localization for target environments               ║{RESET}")
-        print(f"{CYAN}║    • Automated SFTP configuration                            ║{RESET}")
-        print(f"{CYAN}║    • Collector state standardization                         ║{RESET}")
-        print(f"{CYAN}║    • CAR/XML processing                                      ║{RESET}")
-        print(f"{CYAN}║                                                              ║{RESET}")
-        print(f"{CYAN}║  {BOLD}WORKFLOW:{RESET}{CYAN}                                                   ║{RESET}")
-        print(f"{CYAN}║    1. Import source configuration                            ║{RESET}")
-        print(f"{CYAN}║    2. Set localization parameters                            ║{RESET}")
-        print(f"{CYAN}║                                                              ║{RESET}")
-        print(f"{CYAN}╔══════════════════════════════════════════════════════════════╗{RESET}")
-        print(f"{CYAN}║  {BOLD}SAFETY:{RESET} Original preservation  •  Audit logging             {CYAN}║{RESET}")
-        print(f"{CYAN}╚══════════════════════════════════════════════════════════════╝{RESET}")
+        print(MAIN_BANNER)
 
         # Display compatibility warning and get user acknowledgment
         display_xml_compatibility_warning()
@@ -1764,67 +1874,36 @@ def main() -> None:
                 process_xml_file(xml_path, modified_xml_path)
                 operations_performed.append(f"Processed extracted XML: {os.path.basename(xml_path)}")
 
-                # Note: The original XML file will be deleted during repackaging
+                # The cleaned CAR is written in one pass from the original archive and
+                # the modified XML
                 logger.info("\nRepackaging CAR file (original XML will be removed)...")
                 logger.info("Beginning CAR repackaging")
+                logger.info("This will remove non-modified XML files and rename remaining XML files by removing '_modified' suffix")
 
-                # Repackage the CAR file with the modified XML (this will delete the original XML)
                 log_operation_start("CAR repackaging")
-                output_car = repackage_car_file(temp_dir, file_path, xml_path, modified_xml_path)
+                if os.path.exists(modified_xml_path):
+                    cleaned_car = repackage_cleaned_car(file_path, temp_dir, xml_path, modified_xml_path, output_car_path)
+                else:
+                    logger.error(f"Modified XML file not found: {modified_xml_path}")
+                    cleaned_car = ""
                 log_operation_end("CAR repackaging")
 
-                if output_car:
-                    logger.info(f"Created modified CAR file: {output_car}")
-                    operations_performed.append(f"Created modified CAR file: {os.path.basename(output_car)}")
-
-                    # Perform final cleanup and repackaging
-                    logger.info("Beginning final CAR cleanup")
-                    logger.info("This will remove non-modified XML files and rename remaining XML files by removing '_modified' suffix")
-
-                    log_operation_start("CAR cleanup")
-                    cleaned_car = cleanup_and_repackage_car(output_car)
-                    log_operation_end("CAR cleanup")
-
-                    if cleaned_car:
-                        logger.info(f"Created cleaned CAR file: {cleaned_car}")
-                        print(f"Successfully created cleaned CAR file: {cleaned_car}")
-                        operations_performed.append(f"Created cleaned CAR file: {os.path.basename(cleaned_car)}")
-
-                        target_dir = os.path.join(os.getcwd(), "Modified files")
-                        os.makedirs(target_dir, exist_ok=True)
-                        logger.info(f"Ensured target directory exists: {target_dir}")
-                        filename = os.path.basename(cleaned_car)
-                        name, ext = os.path.splitext(filename)
-
-                        counter = 1
-                        new_filename = filename
-                        destination = os.path.join(target_dir, new_filename)
-
-                        while os.path.exists(destination):
-                            logger.warning(f"File already exists: {destination}. Attempting new filename.")
-                            new_filename = f"{name}({counter}){ext}"
-                            destination = os.path.join(target_dir, new_filename)
-                            counter += 1
-                        shutil.move(cleaned_car, destination)
-                        logger.info(f"Moved cleaned CAR file to: {destination}")
-                        print(f"Moved to: {destination}")
-
-
-                        # Automatically remove the intermediate file
-                        cleanup_intermediate = True  # Set to always True
-                        if cleanup_intermediate:
-                            try:
-                                os.remove(output_car)
-                                logger.info(f"Removed intermediate file: {output_car}")
-                                print(f"Automatically removed intermediate file: {output_car}")
-                            except OSError as e:
-                                logger.info(f"Could not remove intermediate file: {e}")
-                    else:
-                        logger.error("Failed to create cleaned CAR file")
-                        print("Failed to create cleaned CAR file.")
+                if cleaned_car:
+                    filename = os.path.basename(cleaned_car)
+                    logger.info(f"Created cleaned CAR file: {cleaned_car}")
+                    print(f"Successfully created cleaned CAR file: {cleaned_car}")
+                    operations_performed.append(f"Created cleaned CAR file: {filename}")
+
+                    target_dir = os.path.join(os.getcwd(), "Modified files")
+                    os.makedirs(target_dir, exist_ok=True)
+                    logger.info(f"Ensured target directory exists: {target_dir}")
+                    destination = claim_unique_destination(target_dir, filename)
+                    move_file(cleaned_car, destination)
+                    logger.info(f"Moved cleaned CAR file to: {destination}")
+                    print(f"Moved to: {destination}")
                 else:
-                    logger.error("Failed to create modified CAR file")
-                    # print("\nFailed to create modified CAR file.")
+                    logger.error("Failed to create cleaned CAR file")
+                    print("Failed to create cleaned CAR file.")
 
             finally:
                 # Clean up temporary directory
@@ -1886,39 +1965,7 @@ def process_xml_file(file_path: str, output_file: str) -> None:
         logger.info(f"Output will be saved to: {output_file}")
 
         # Ask the user which operations they want to perform
-        operations = []
-        print("\nSelect operations to perform (y/n for each):")
-        logger.info("Prompting user for operations to perform")
-
-        # Paths processing
-        if get_yes_no_input("Update Collector and Distributer Disk paths? (y/n): "):
-            operations.append("paths")
-            logger.info("User selected to process paths")
-
-        # SFTP host update
-        if get_yes_no_input("Update SFTP host IP? (y/n): "):
-            operations.append("host")
-            logger.info("User selected to update SFTP host IP")
-
-        # SFTP username update
-        if get_yes_no_input("Update SFTP username? (y/n): "):
-            operations.append("username")
-            logger.info("User selected to update SFTP username")
-
-        # SFTP password update
-        if get_yes_no_input("Update encrypted SFTP password? (y/n): "):
-            operations.append("password")
-            logger.info("User selected to update SFTP password")
-
-        # SFTP pass flags update
-        if get_yes_no_input("Update SFTP 'Password Not Required Field' to no? (y/n): "):
-            operations.append("flags")
-            logger.info("User selected to update password flags")
-
-        # Default Stopped State update 
-        if get_yes_no_input("Set 'Default Stopped' to 'True' for all collectors? (y/n): "):
-            operations.append("default_stopped")
-            logger.info("User selected to update default stopped state")
+        operations = select_operations()
 
         if not operations:
             logger.warning("No operations selected. Exiting.")
@@ -1927,27 +1974,63 @@ def process_xml_file(file_path: str, output_file: str) -> None:
 
         logger.info(f"Selected operations: {', '.join(operations)}")
 
-        # Create a temporary working file for each operation
-        temp_file = f"{os.path.splitext(output_file)[0]}_temp{os.path.splitext(output_file)[1]}"
-        logger.info(f"Temporary working file: {temp_file}")
-
-        # Start with the original file
-        current_input = file_path
-        logger.info(f"Initial input file: {current_input}")
+        # Read the file once; every operation is applied to the in-memory content
+        try:
+            xml_content = read_xml_content(file_path)
+        except IOError as e:
+            print(f"Error reading file: {e}")
+            logger.error(f"Failed to read file '{file_path}': {e}")
+            error_msg = f"Failed to read file '{file_path}': {e}"
+            handle_error_with_countdown(error_msg)
+        
+        # Collect the input of every selected operation first, so all tag
+        # rewrites are applied to the content in a single pass
+        handlers: Dict[str, TagHandler] = {}
+        all_paths: List[Tuple[str, str]] = []
 
-        # Process paths if selected
         if "paths" in operations:
             prefix_path = prompt_for_prefix_path()
             logger.info(f"User provided path prefix: {prefix_path}")
+            handlers.update(path_handlers(prefix_path, all_paths))
 
-            # Process the XML file to collect all paths
-            log_operation_start("path extraction")
-            all_paths = []
-            print("\nProcessing XML file for paths...")
-            for line in read_xml_lines(current_input):
-                extractions = extract_paths_from_line(line)
-                all_paths.extend([(tag, path) for tag, path, _ in extractions])
+        if "host" in operations:
+            new_host = prompt_for_sftp_host()
+            logger.info(f"User provided new SFTP host: {new_host}")
+            print(f"\nUpdating SFTP host to: {new_host} (in both ppsSFTPHostF and neSFTPClientHostF tags)")
+            handlers.update(host_handlers(new_host))
+
+        if "username" in operations:
+            new_username = prompt_for_sftp_username()
+            logger.info(f"User provided new SFTP username: {new_username}")
+            print(f"\nUpdating SFTP username to: {new_username} (in both ppsSFTPUserF and neSFTPClientUserF tags)")
+            handlers.update(username_handlers(new_username))
+
+        if "password" in operations:
+            new_password = prompt_for_encrypted_password()
+            logger.info("User provided new encrypted SFTP password")
+            print("\nUpdating SFTP encrypted password...")
+            handlers.update(password_handlers(new_password))
+
+        if "flags" in operations:
+            logger.info("Updating SFTP pass flags to 0")
+            print("\nUpdating all SFTP Password not required field to 0...")
+            handlers.update(pass_flag_handlers())
+
+        if "default_stopped" in operations:
+            logger.info("Updating default stopped state to True for all collectors")
+            print("\nUpdating all collectors to 'Default Stopped' state...")
+            handlers.update(default_stopped_handlers())
 
+        # Apply every rewrite in one pass over the content
+        log_operation_start("XML tag rewrite")
+        print("\nProcessing XML file...")
+        xml_content, tag_counts = transform_xml_content(xml_content, handlers)
+        log_operation_end("XML tag rewrite")
+        content_modified = False
+
+        # Report the paths collected during the pass
+        if "paths" in operations:
+            log_operation_start("path extraction")
             if not all_paths:
                 logger.warning("No matching path tags found in the XML file")
                 print("No matching path tags found in the XML file.")
@@ -1957,199 +2040,80 @@ def process_xml_file(file_path: str, output_file: str) -> None:
 
                 # Create mkdir commands
                 mkdir_commands = create_mkdir_commands(all_paths, prefix_path)
-                logger.info(f"Generated {len(mkdir_commands)} mkdir commands")
+                logger.info(f"Generated {len(mkdir_commands)} unique mkdir commands")
 
                 # Write the mkdir commands to a file
-                write_mkdir_script(mkdir_commands, file_path)
+                write_mkdir_script(mkdir_commands, file_path, len(all_paths), extract_name_from_content(xml_content))
                 logger.info("Wrote mkdir commands to 'commands_to_create_the_paths_manually.txt'")
                 operations_performed.append("Generated mkdir commands file: 'commands_to_create_the_paths_manually.txt'")
 
-                # Generate the modified XML file
-                logger.info(f"Generating modified XML with prefix: {prefix_path}")
-                regenerate_xml(current_input, temp_file, prefix_path)
-                logger.info(f"Generated temporary XML file: {temp_file}")
-
-                # Update the current input for the next operation
-                current_input = temp_file
-                logger.info(f"Updated current input to: {current_input}")
+                logger.info(f"Updated paths in the XML with prefix: {prefix_path}")
+                content_modified = True
             log_operation_end("path extraction")
 
-        # Update SFTP host if selected
+        # Report the SFTP host update
         if "host" in operations:
-            new_host = prompt_for_sftp_host()
-            logger.info(f"User provided new SFTP host: {new_host}")
-            print(f"\nUpdating SFTP host to: {new_host} (in both ppsSFTPHostF and neSFTPClientHostF tags)")
-
-            # Create a new temporary file for this operation
-            temp_output = f"{os.path.splitext(output_file)[0]}_temp2{os.path.splitext(output_file)[1]}"
-            logger.info(f"Temporary output file for host update: {temp_output}")
-
-            log_operation_start("SFTP host update")
-            success = update_sftp_host(current_input, temp_output, new_host)
-
-            if success:
+            if tags_found(tag_counts, HOST_TAGS):
                 logger.info("SFTP host updated successfully")
                 print("SFTP host updated successfully.")
                 operations_performed.append(f"Updated SFTP host to: {new_host}")
-
-                # Remove the old temp file if it's not the original input
-                if current_input != file_path:
-                    try:
-                        os.remove(current_input)
-                        logger.debug(f"Removed temporary file: {current_input}")
-                    except OSError as e:
-                        logger.error(f"Failed to remove temporary file: {e}")
-
-                current_input = temp_output
-                logger.info(f"Updated current input to: {current_input}")
+                content_modified = True
             else:
                 logger.error("Failed to update SFTP host")
                 print("Failed to update SFTP host.")
-            log_operation_end("SFTP host update")
 
-        # Update SFTP username if selected
+        # Report the SFTP username update
         if "username" in operations:
-            new_username = prompt_for_sftp_username()
-            logger.info(f"User provided new SFTP username: {new_username}")
-            print(f"\nUpdating SFTP username to: {new_username} (in both ppsSFTPUserF and neSFTPClientUserF tags)")
-
-            # Create a new temporary file for this operation
-            temp_output = f"{os.path.splitext(output_file)[0]}_temp3{os.path.splitext(output_file)[1]}"
-            logger.info(f"Temporary output file for username update: {temp_output}")
-
-            log_operation_start("SFTP username update")
-            success = update_sftp_username(current_input, temp_output, new_username)
-
-            if success:
+            if tags_found(tag_counts, USERNAME_TAGS):
                 logger.info("SFTP username updated successfully")
                 print("SFTP username updated successfully.")
                 operations_performed.append(f"Updated SFTP username to: {new_username}")
-
-                # Remove the old temp file if it's not the original input
-                if current_input != file_path:
-                    try:
-                        os.remove(current_input)
-                        logger.debug(f"Removed temporary file: {current_input}")
-                    except OSError as e:
-                        logger.error(f"Failed to remove temporary file: {e}")
-
-                current_input = temp_output
-                logger.info(f"Updated current input to: {current_input}")
+                content_modified = True
             else:
                 logger.error("Failed to update SFTP username")
                 print("Failed to update SFTP username.")
-            log_operation_end("SFTP username update")
 
-        # Update SFTP password if selected
+        # Report the SFTP password update
         if "password" in operations:
-            new_password = prompt_for_encrypted_password()
-            logger.info("User provided new encrypted SFTP password")
-            print("\nUpdating SFTP encrypted password...")
-
-            # Create a new temporary file for this operation
-            temp_output = f"{os.path.splitext(output_file)[0]}_temp4{os.path.splitext(output_file)[1]}"
-            logger.info(f"Temporary output file for password update: {temp_output}")
-
-            log_operation_start("SFTP password update")
-            success = update_sftp_password(current_input, temp_output, new_password)
-
-            if success:
+            if tags_found(tag_counts, PASSWORD_TAGS):
                 logger.info("SFTP password updated successfully")
                 print("SFTP password updated successfully.")
                 operations_performed.append("Updated SFTP encrypted password")
-
-                # Remove the old temp file if it's not the original input
-                if current_input != file_path:
-                    try:
-                        os.remove(current_input)
-                        logger.debug(f"Removed temporary file: {current_input}")
-                    except OSError as e:
-                        logger.error(f"Failed to remove temporary file: {e}")
-
-                current_input = temp_output
-                logger.info(f"Updated current input to: {current_input}")
+                content_modified = True
             else:
                 logger.error("Failed to update SFTP password")
                 print("Failed to update SFTP password.")
-            log_operation_end("SFTP password update")
 
-        # Update SFTP pass flags if selected
+        # Report the SFTP pass flags update
         if "flags" in operations:
-            logger.info("Updating SFTP pass flags to 0")
-            print("\nUpdating all SFTP Password not required field to 0...")
-
-            # Create a new temporary file for this operation
-            temp_output = f"{os.path.splitext(output_file)[0]}_temp5{os.path.splitext(output_file)[1]}"
-            logger.info(f"Temporary output file for pass flags update: {temp_output}")
-
-            log_operation_start("SFTP pass flags update")
-            success = update_sftp_pass_flags(current_input, temp_output)
-
-            if success:
+            if tags_found(tag_counts, FLAG_TAGS):
                 logger.info("SFTP pass flags updated successfully")
                 print("SFTP password not required field updated successfully to No.")
                 operations_performed.append("Updated SFTP password not required field to No")
-
-                # Remove the old temp file if it's not the original input
-                if current_input != file_path:
-                    try:
-                        os.remove(current_input)
-                        logger.debug(f"Removed temporary file: {current_input}")
-                    except OSError as e:
-                        logger.error(f"Failed to remove temporary file: {e}")
-
-                current_input = temp_output
-                logger.info(f"Updated current input to: {current_input}")
+                content_modified = True
             else:
                 logger.error("Failed to update SFTP pass flags")
                 print("Failed to update password not required field to 'No'.")
-            log_operation_end("SFTP pass flags update")
 
-        # Update Default Stopped State if selected
+        # Report the Default Stopped State update
         if "default_stopped" in operations:
-            logger.info("Updating default stopped state to True for all collectors")
-            print("\nUpdating all collectors to 'Default Stopped' state...")
-
-            # Create a new temporary file for this operation
-            temp_output = f"{os.path.splitext(output_file)[0]}_temp6{os.path.splitext(output_file)[1]}"
-            logger.info(f"Temporary output file for default stopped update: {temp_output}")
-
-            log_operation_start("default stopped state update")
-            success = update_default_stopped_state(current_input, temp_output)
-
-            if success:
+            if tags_found(tag_counts, DEFAULT_STOPPED_TAGS):
                 logger.info("Default stopped state updated successfully")
                 print("Default Stopped state updated successfully to True for all collectors.")
                 operations_performed.append("Set Default Stopped state to True for all collectors")
-
-                # Remove the old temp file if it's not the original input
-                if current_input != file_path:
-                    try:
-                        os.remove(current_input)
-                        logger.debug(f"Removed temporary file: {current_input}")
-                    except OSError as e:
-                        logger.error(f"Failed to remove temporary file: {e}")
-
-                current_input = temp_output
-                logger.info(f"Updated current input to: {current_input}")
+                content_modified = True
             else:
                 logger.error("Failed to update default stopped state")
                 print("Failed to update Default Stopped state.")
-            log_operation_end("default stopped state update")
 
-        # Rename the final temporary file to the desired output file
-        if current_input != file_path:
+        # Write the modified content to the desired output file in one go
+        if content_modified:
             try:
-                # If the output file already exists (from a previous run), remove it
-                if os.path.exists(output_file):
-                    os.remove(output_file)
-                    logger.info(f"Removed existing output file: {output_file}")
-
-                os.rename(current_input, output_file)
+                write_xml_content(output_file, xml_content)
                 logger.info(f"Saved final output to: {output_file}")
                 print(f"\nFinal output saved to: '{output_file}'")
                 operations_performed.append(f"Final output saved to: {output_file}")
-
+                
                 # Log final path information
                 logger.info("=" * 50)
                 logger.info("FINAL FILE PATHS")
@@ -2157,26 +2121,15 @@ def process_xml_file(file_path: str, output_file: str) -> None:
                 logger.info(f"Original input file: {file_path}")
                 logger.info(f"Modified output file: {output_file}")
                 logger.info("=" * 50)
-
+            
             except OSError as e:
-                logger.error(f"Error renaming final output file: {e}")
-                print(f"Error renaming final output file: {e}")
-                print(f"Final output is available at: '{current_input}'")
+                logger.error(f"Error writing final output file: {e}")
+                print(f"Error writing final output file: {e}")
         else:
             # No operations modified the file
             logger.warning("No modifications were made to the XML file")
             print("\nNo modifications were made to the XML file.")
 
-        # Clean up any temporary files that might have been left behind
-        for i in range(1, 7):
-            temp_path = f"{os.path.splitext(output_file)[0]}_temp{i}{os.path.splitext(output_file)[1]}"
-            if os.path.exists(temp_path):
-                try:
-                    os.remove(temp_path)
-                    logger.debug(f"Cleaned up temporary file: {temp_path}")
-                except OSError as e:
-                    logger.error(f"Failed to clean up temporary file: {temp_path}, error: {e}")
-
         # Summarize operations performed
         log_summary(operations_performed)
 
@@ -2199,16 +2152,6 @@ def process_xml_file(file_path: str, output_file: str) -> None:
             logger.error("XML processing interrupted by user (^C)")
             print("\nXML processing interrupted by user. Exiting.")
             handle_user_cancellation('XML processing interrupted by user. Exiting.')
-            # Clean up any temporary files that might have been created
-            for i in range(1, 7):
-                temp_path = f"{os.path.splitext(output_file)[0]}_temp{i}{os.path.splitext(output_file)[1]}"
-                if os.path.exists(temp_path):
-                    try:
-                        os.remove(temp_path)
-                        logger.debug(f"Cleaned up temporary file: {temp_path}")
-                    except OSError as e:
-                        logger.error(f"Failed to clean up temporary file: {temp_path}, error: {e}")
-                        
             error_msg = "Processing interrupted by user. Exiting."
             handle_user_cancellation(error_msg)
     except Exception as e: